@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -19,6 +20,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "finance.middleware.RequestTimingMiddleware",
+    "finance.middleware.PrimaryPinningMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -32,7 +35,7 @@ ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "finance.templating.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -47,6 +50,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
 
 DATABASES = {
     "default": {
@@ -55,6 +59,60 @@ DATABASES = {
     }
 }
 
+DATABASE_ROUTERS = ["finance.routers.ReadReplicaRouter"]
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "money-manager",
+    }
+}
+
+FINANCE_CACHE_ALIAS = "default"
+FINANCE_CACHE_TIMEOUT = 60 * 60
+FINANCE_IMPORT_BATCH_SIZE = 1000
+FINANCE_EXPORT_CHUNK_SIZE = 2000
+FINANCE_REQUEST_TIMING = False
+FINANCE_DUPLICATE_QUERY_THRESHOLD = 3
+FINANCE_READ_DATABASE = None
+FINANCE_PRIMARY_PIN_SECONDS = 10
+FINANCE_SQLITE_PRAGMAS = {}
+
+if os.environ.get("FINANCE_SQLITE_PRODUCTION") == "1":
+    DATABASES["default"].update(
+        {
+            "CONN_MAX_AGE": 600,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "transaction_mode": "IMMEDIATE",
+            },
+        }
+    )
+    FINANCE_SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -20000,
+        "mmap_size": 134217728,
+        "temp_store": "MEMORY",
+    }
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+        },
+    },
+    "loggers": {
+        "finance": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -1,6 +1,16 @@
 from django.contrib import admin
 
-from finance.models import Category, FixedExpense, Income, PaymentMethod, Saving, SavingGoal, VariableExpense
+from finance.models import (
+    Category,
+    CategoryBudget,
+    FixedExpense,
+    Income,
+    PaymentMethod,
+    RecurringFixedExpense,
+    Saving,
+    SavingGoal,
+    VariableExpense,
+)
 
 
 @admin.register(Category)
@@ -30,6 +40,13 @@ class FixedExpenseAdmin(admin.ModelAdmin):
     search_fields = ("description",)
 
 
+@admin.register(RecurringFixedExpense)
+class RecurringFixedExpenseAdmin(admin.ModelAdmin):
+    list_display = ("description", "amount", "due_day", "is_active", "user")
+    list_filter = ("is_active",)
+    search_fields = ("description",)
+
+
 @admin.register(VariableExpense)
 class VariableExpenseAdmin(admin.ModelAdmin):
     list_display = ("date", "description", "amount", "expense_type", "user")
@@ -49,3 +66,10 @@ class SavingGoalAdmin(admin.ModelAdmin):
     list_display = ("name", "target_amount", "is_active", "user", "created_at")
     list_filter = ("is_active", "created_at")
     search_fields = ("name",)
+
+
+@admin.register(CategoryBudget)
+class CategoryBudgetAdmin(admin.ModelAdmin):
+    list_display = ("category", "amount", "is_active", "user")
+    list_filter = ("is_active", "category__kind")
+    search_fields = ("category__name",)
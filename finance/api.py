@@ -0,0 +1,105 @@
+import hashlib
+
+from django.contrib.auth.decorators import login_required
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET
+
+from finance.caching import cached, get_data_version
+from finance.models import FixedExpense, Income, Saving, VariableExpense
+from finance.routers import read_from_replica
+from finance.services import (
+    get_category_breakdown,
+    get_daily_series,
+    get_expense_category_breakdown,
+    get_last_12_months_series,
+    get_last_periods_series,
+    get_month_kpis,
+    get_saving_distribution,
+    get_saving_totals,
+    get_top_expenses,
+    get_total,
+    get_year_12_months_series,
+    get_yearly_overview_series,
+)
+
+CHART_MODULES = {
+    "income": Income,
+    "fixed": FixedExpense,
+    "variable": VariableExpense,
+    "saving": Saving,
+}
+
+CHART_DATASETS = {
+    "kpis": lambda user, year, month, model, granularity: get_month_kpis(user, year, month),
+    "yearly_series": lambda user, year, month, model, granularity: get_yearly_overview_series(user, year),
+    "expense_categories": lambda user, year, month, model, granularity: get_expense_category_breakdown(user, year, month),
+    "top_expenses": lambda user, year, month, model, granularity: {"items": get_top_expenses(user, year, month)},
+    "module_total": lambda user, year, month, model, granularity: {"total_month": get_total(user, model, year, month)},
+    "last_12": lambda user, year, month, model, granularity: get_last_12_months_series(user, model),
+    "trend": lambda user, year, month, model, granularity: get_last_periods_series(user, model, granularity),
+    "categories": lambda user, year, month, model, granularity: get_category_breakdown(user, model, year, month),
+    "daily_series": lambda user, year, month, model, granularity: get_daily_series(user, model, year, month),
+    "saving_totals": lambda user, year, month, model, granularity: get_saving_totals(user, year, month),
+    "saving_distribution": lambda user, year, month, model, granularity: get_saving_distribution(user, year),
+    "saving_series": lambda user, year, month, model, granularity: get_year_12_months_series(Saving, user, year),
+}
+MODULE_DATASETS = {"module_total", "last_12", "trend", "categories", "daily_series"}
+TREND_GRANULARITIES = ("week", "month", "quarter")
+
+
+def _chart_params(request, dataset):
+    if dataset not in CHART_DATASETS:
+        raise Http404("Conjunto de datos desconocido.")
+    today = timezone.localdate()
+    try:
+        year = int(request.GET.get("year", today.year))
+        month = int(request.GET.get("month", today.month))
+    except ValueError as exc:
+        raise Http404("Periodo inválido.") from exc
+    if not 1 <= month <= 12:
+        raise Http404("Periodo inválido.")
+    model = CHART_MODULES.get(request.GET.get("module", ""))
+    if dataset in MODULE_DATASETS and model is None:
+        raise Http404("Módulo desconocido.")
+    granularity = request.GET.get("granularity", "month")
+    if granularity not in TREND_GRANULARITIES:
+        raise Http404("Granularidad desconocida.")
+    return year, month, model, granularity
+
+
+def _chart_etag(request, dataset):
+    year, month, model, granularity = _chart_params(request, dataset)
+    module = model._meta.model_name if model else ""
+    raw = ":".join(
+        [
+            dataset,
+            str(year),
+            str(month),
+            module,
+            granularity,
+            timezone.localdate().isoformat(),
+            str(get_data_version(request.user.pk)),
+        ]
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+@login_required
+@require_GET
+@condition(etag_func=_chart_etag)
+@read_from_replica
+def chart_data(request, dataset):
+    year, month, model, granularity = _chart_params(request, dataset)
+    module = model._meta.model_name if model else ""
+    data = cached(
+        request.user,
+        f"chart:{dataset}",
+        (year, month, module, granularity, timezone.localdate().isoformat()),
+        lambda: CHART_DATASETS[dataset](request.user, year, month, model, granularity),
+    )
+    response = JsonResponse(data, encoder=DjangoJSONEncoder)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
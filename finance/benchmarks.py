@@ -0,0 +1,202 @@
+import datetime
+import math
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from finance.caching import bump_data_version
+from finance.database import current_pragmas
+from finance.models import Category, PaymentMethod, VariableExpense
+
+BENCHMARK_VIEWS = [
+    ("dashboard_general", {}),
+    ("income_dashboard", {}),
+    ("fixed_expense_dashboard", {}),
+    ("variable_expense_dashboard", {}),
+    ("saving_dashboard", {}),
+    ("income_list", {}),
+    ("fixed_expense_list", {}),
+    ("variable_expense_list", {}),
+    ("saving_list", {}),
+    ("variable_expense_list", {"q": "com"}),
+]
+PERCENTILES = (50, 90, 99)
+CONCURRENCY_READ_VIEWS = [name for name, _ in BENCHMARK_VIEWS if name.endswith("dashboard") or name == "dashboard_general"]
+CONCURRENCY_DESCRIPTION = "Benchmark de concurrencia"
+
+
+def percentile(values: list, pct: int):
+    ordered = sorted(values)
+    index = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def summarize(values: list) -> dict:
+    summary = {f"p{pct}": percentile(values, pct) for pct in PERCENTILES}
+    summary["max"] = max(values)
+    return summary
+
+
+def _request(client, url: str, params: dict, user_id, cold: bool):
+    if cold:
+        bump_data_version(user_id)
+    response = client.get(url, params)
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} respondió {response.status_code}.")
+    return response
+
+
+def run_benchmark(user, iterations: int = 20, warmup: int = 2, cold: bool = False, views=BENCHMARK_VIEWS) -> dict:
+    client = Client()
+    client.force_login(user)
+    results = []
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        for name, params in views:
+            url = reverse(name)
+            for _ in range(warmup):
+                _request(client, url, params, user.pk, cold)
+            timings, queries, memory = [], [], []
+            for _ in range(iterations):
+                with CaptureQueriesContext(connection) as context:
+                    start = time.perf_counter()
+                    _request(client, url, params, user.pk, cold)
+                    timings.append(round((time.perf_counter() - start) * 1000, 3))
+                queries.append(len(context.captured_queries))
+            for _ in range(iterations):
+                tracemalloc.start()
+                try:
+                    _request(client, url, params, user.pk, cold)
+                    memory.append(round(tracemalloc.get_traced_memory()[1] / 1024, 1))
+                finally:
+                    tracemalloc.stop()
+            results.append(
+                {
+                    "view": name,
+                    "params": params,
+                    "wall_ms": summarize(timings),
+                    "queries": summarize(queries),
+                    "peak_kib": summarize(memory),
+                }
+            )
+    return {
+        "user": user.get_username(),
+        "iterations": iterations,
+        "cold_cache": cold,
+        "database": connection.vendor,
+        "results": results,
+    }
+
+
+class WorkerStats:
+    def __init__(self):
+        self.timings = []
+        self.errors = Counter()
+
+
+def _timed(stats: WorkerStats, call) -> None:
+    start = time.perf_counter()
+    try:
+        call()
+    except OperationalError as exc:
+        stats.errors[str(exc)] += 1
+    else:
+        stats.timings.append(round((time.perf_counter() - start) * 1000, 3))
+
+
+def _writer(user, category_id, payment_method_id, deadline: float, stats: WorkerStats) -> None:
+    def write():
+        with transaction.atomic():
+            VariableExpense.objects.create(
+                user=user,
+                date=datetime.date.today(),
+                amount=Decimal("1.00"),
+                category_id=category_id,
+                description=CONCURRENCY_DESCRIPTION,
+                payment_method_id=payment_method_id,
+                expense_type=VariableExpense.TYPE_WANT,
+            )
+
+    try:
+        while time.perf_counter() < deadline:
+            _timed(stats, write)
+    finally:
+        connection.close()
+
+
+def _reader(user, deadline: float, stats: WorkerStats) -> None:
+    client = Client()
+    client.force_login(user)
+    urls = [reverse(name) for name in CONCURRENCY_READ_VIEWS]
+    index = 0
+
+    def read():
+        response = client.get(urls[index % len(urls)])
+        if response.status_code != 200:
+            raise RuntimeError(f"{urls[index % len(urls)]} respondió {response.status_code}.")
+
+    try:
+        while time.perf_counter() < deadline:
+            _timed(stats, read)
+            index += 1
+    finally:
+        connection.close()
+
+
+def _role_summary(workers: list, duration: float) -> dict:
+    timings = [timing for stats in workers for timing in stats.timings]
+    errors = Counter()
+    for stats in workers:
+        errors.update(stats.errors)
+    return {
+        "workers": len(workers),
+        "operations": len(timings),
+        "per_second": round(len(timings) / duration, 1),
+        "latency_ms": summarize(timings) if timings else None,
+        "errors": sum(errors.values()),
+        "error_messages": dict(errors),
+    }
+
+
+def run_concurrency_benchmark(user, writers: int = 4, readers: int = 4, duration: float = 10.0, keep: bool = False) -> dict:
+    categories = Category.objects.filter(user=user, kind=Category.KIND_VARIABLE, is_active=True)
+    category_id = categories.values_list("pk", flat=True).first()
+    payment_method_id = PaymentMethod.objects.filter(user=user, is_active=True).values_list("pk", flat=True).first()
+    if category_id is None or payment_method_id is None:
+        raise ValueError("El usuario necesita una categoría de gasto variable y un método de pago activos.")
+    pragmas = current_pragmas(connection) if connection.vendor == "sqlite" else {}
+    writer_stats = [WorkerStats() for _ in range(writers)]
+    reader_stats = [WorkerStats() for _ in range(readers)]
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        deadline = time.perf_counter() + duration
+        threads = [
+            *(
+                threading.Thread(target=_writer, args=(user, category_id, payment_method_id, deadline, stats))
+                for stats in writer_stats
+            ),
+            *(threading.Thread(target=_reader, args=(user, deadline, stats)) for stats in reader_stats),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    if not keep:
+        for expense in VariableExpense.objects.filter(user=user, description=CONCURRENCY_DESCRIPTION).iterator():
+            expense.delete()
+    return {
+        "user": user.get_username(),
+        "database": connection.vendor,
+        "duration_s": duration,
+        "transaction_mode": connection.settings_dict.get("OPTIONS", {}).get("transaction_mode"),
+        "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE"),
+        "pragmas": pragmas,
+        "writes": _role_summary(writer_stats, duration),
+        "reads": _role_summary(reader_stats, duration),
+    }
@@ -0,0 +1,80 @@
+from django.db import connections, router, transaction
+
+from finance.caching import bump_data_version_on_commit
+from finance.ledger import LEDGER_FIELDS, add_ledger_entries, remove_ledger_entries
+from finance.models import LedgerEntry, Saving
+from finance.rollups import add_delta, add_goal_delta, apply_bulk_deltas, apply_goal_deltas, chunks, rollup_key
+from finance.search import index_new_transactions, unindex_transactions
+
+SELECTION_FIELDS = ("pk", "user_id", "date", "category_id", "amount")
+
+
+def bulk_create_transactions(model, instances: list) -> list:
+    deltas, goal_deltas = {}, {}
+    with transaction.atomic():
+        created = model.objects.bulk_create(instances)
+        for instance in created:
+            key = rollup_key(instance.user_id, model.CATEGORY_KIND, instance.date, instance.category_id)
+            add_delta(deltas, key, instance.amount)
+            add_goal_delta(goal_deltas, getattr(instance, "goal_id", None), instance.amount)
+        apply_bulk_deltas(deltas)
+        apply_goal_deltas(goal_deltas)
+        index_new_transactions(model, created)
+        add_ledger_entries(model, created)
+        for user_id in {instance.user_id for instance in created}:
+            bump_data_version_on_commit(user_id)
+    return created
+
+
+def _selected_rows(model, queryset) -> list:
+    fields = (*SELECTION_FIELDS, "goal_id") if model is Saving else SELECTION_FIELDS
+    return list(queryset.order_by().values_list(*fields))
+
+
+def _delete_rows(model, alias: str, pks: list) -> None:
+    connection = connections[alias]
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({', '.join(['%s'] * len(pks))})", pks)
+
+
+def bulk_delete_transactions(model, queryset) -> int:
+    deltas, goal_deltas = {}, {}
+    alias = router.db_for_write(model)
+    with transaction.atomic(using=alias):
+        rows = _selected_rows(model, queryset.using(alias))
+        for pk, user_id, date, category_id, amount, *goal in rows:
+            add_delta(deltas, rollup_key(user_id, model.CATEGORY_KIND, date, category_id), amount, -1)
+            add_goal_delta(goal_deltas, goal[0] if goal else None, amount, -1)
+        for chunk in chunks([row[0] for row in rows]):
+            unindex_transactions(model, chunk)
+            remove_ledger_entries(model, chunk)
+            _delete_rows(model, alias, chunk)
+        apply_bulk_deltas(deltas)
+        apply_goal_deltas(goal_deltas)
+        for user_id in {row[1] for row in rows}:
+            bump_data_version_on_commit(user_id)
+    return len(rows)
+
+
+def bulk_update_transactions(model, queryset, **changes) -> int:
+    deltas = {}
+    ledger_changes = {field: value for field, value in changes.items() if field in LEDGER_FIELDS}
+    alias = router.db_for_write(model)
+    with transaction.atomic(using=alias):
+        rows = _selected_rows(model, queryset.using(alias))
+        new_category_id = changes.get("category_id")
+        for pk, user_id, date, category_id, amount, *_ in rows:
+            if new_category_id is None or new_category_id == category_id:
+                continue
+            add_delta(deltas, rollup_key(user_id, model.CATEGORY_KIND, date, category_id), amount, -1)
+            add_delta(deltas, rollup_key(user_id, model.CATEGORY_KIND, date, new_category_id), amount)
+        for chunk in chunks([row[0] for row in rows]):
+            model.objects.using(alias).filter(pk__in=chunk).update(**changes)
+            if ledger_changes:
+                LedgerEntry.objects.filter(kind=model.CATEGORY_KIND, source_id__in=chunk).update(**ledger_changes)
+        apply_bulk_deltas(deltas)
+        for user_id in {row[1] for row in rows}:
+            bump_data_version_on_commit(user_id)
+    return len(rows)
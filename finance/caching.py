@@ -0,0 +1,122 @@
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+_MISSING = object()
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _cache():
+    return caches[getattr(settings, "FINANCE_CACHE_ALIAS", "default")]
+
+
+def is_cache_shared() -> bool:
+    return not isinstance(_cache(), LocMemCache)
+
+
+def _version_key(user_id) -> str:
+    return f"finance:version:{user_id}"
+
+
+def _record(outcome: str) -> None:
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def get_cache_stats() -> dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    total = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / total if total else 0.0
+    return stats
+
+
+def reset_cache_stats() -> None:
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
+
+
+def get_data_version(user_id) -> int:
+    cache = _cache()
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        initial = time.time_ns()
+        cache.add(key, initial, timeout=None)
+        version = cache.get(key, initial)
+    return version
+
+
+def bump_data_version(user_id) -> None:
+    cache = _cache()
+    key = _version_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_data_version_on_commit(user_id) -> None:
+    transaction.on_commit(lambda: bump_data_version(user_id))
+
+
+def _cached_key(user_id, version, name: str, args) -> str:
+    return ":".join(["finance", str(user_id), str(version), name, *(str(arg) for arg in args)])
+
+
+def cached(user, name: str, args, compute):
+    key = _cached_key(user.pk, get_data_version(user.pk), name, args)
+    cache = _cache()
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        _record("hits")
+        return value
+    _record("misses")
+    value = compute()
+    cache.set(key, value, timeout=getattr(settings, "FINANCE_CACHE_TIMEOUT", 60 * 60))
+    return value
+
+
+async def acached(user, name: str, args, compute):
+    version = await sync_to_async(get_data_version)(user.pk)
+    key = _cached_key(user.pk, version, name, args)
+    cache = _cache()
+    value = await cache.aget(key, _MISSING)
+    if value is not _MISSING:
+        _record("hits")
+        return value
+    _record("misses")
+    value = await compute()
+    await cache.aset(key, value, timeout=getattr(settings, "FINANCE_CACHE_TIMEOUT", 60 * 60))
+    return value
+
+
+def _form_choices_key(user_id) -> str:
+    return f"finance:choices:{user_id}"
+
+
+def cached_form_choices(user_id, compute):
+    cache = _cache()
+    key = _form_choices_key(user_id)
+    value = cache.get(key)
+    if value is not None:
+        _record("hits")
+        return value
+    _record("misses")
+    value = compute()
+    cache.set(key, value, timeout=getattr(settings, "FINANCE_CACHE_TIMEOUT", 60 * 60))
+    return value
+
+
+def invalidate_form_choices(user_id) -> None:
+    _cache().delete(_form_choices_key(user_id))
+
+
+def invalidate_form_choices_on_commit(user_id) -> None:
+    transaction.on_commit(lambda: invalidate_form_choices(user_id))
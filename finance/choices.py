@@ -0,0 +1,29 @@
+from finance.caching import cached_form_choices
+from finance.models import Category, PaymentMethod, SavingGoal
+
+CATEGORY_FIELDS = ("id", "user_id", "name", "kind")
+PAYMENT_METHOD_FIELDS = ("id", "user_id", "name")
+GOAL_FIELDS = ("id", "user_id", "name", "target_amount")
+
+
+def build_form_choices(user_id) -> dict:
+    categories = {kind: [] for kind, _ in Category.KIND_CHOICES}
+    for row in Category.objects.filter(user_id=user_id, is_active=True).values_list(*CATEGORY_FIELDS):
+        categories[row[3]].append(row)
+    return {
+        "categories": categories,
+        "payment_methods": list(
+            PaymentMethod.objects.filter(user_id=user_id, is_active=True).values_list(*PAYMENT_METHOD_FIELDS)
+        ),
+        "goals": list(SavingGoal.objects.filter(user_id=user_id, is_active=True).values_list(*GOAL_FIELDS)),
+    }
+
+
+def get_form_choices(user) -> dict:
+    return cached_form_choices(user.pk, lambda: build_form_choices(user.pk))
+
+
+def category_rows(choices: dict, kind=None) -> list:
+    if kind:
+        return choices["categories"].get(kind, [])
+    return sorted((row for rows in choices["categories"].values() for row in rows), key=lambda row: row[2])
@@ -0,0 +1,32 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+
+from finance.middleware import track_queries
+
+
+def _run_in_worker(call):
+    try:
+        with track_queries():
+            return call()
+    finally:
+        close_old_connections()
+
+
+def _in_transaction() -> bool:
+    return connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+def _run_in_order(calls: dict) -> dict:
+    return {name: call() for name, call in calls.items()}
+
+
+async def run_concurrently(calls: dict) -> dict:
+    if await sync_to_async(_in_transaction)():
+        return await sync_to_async(_run_in_order)(calls)
+    names = list(calls)
+    results = await asyncio.gather(
+        *(sync_to_async(_run_in_worker, thread_sensitive=False)(calls[name]) for name in names)
+    )
+    return dict(zip(names, results))
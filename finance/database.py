@@ -0,0 +1,22 @@
+from django.conf import settings
+
+
+def sqlite_pragmas() -> dict:
+    return getattr(settings, "FINANCE_SQLITE_PRAGMAS", {})
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def current_pragmas(connection) -> dict:
+    values = {}
+    with connection.cursor() as cursor:
+        for name in sqlite_pragmas():
+            cursor.execute(f"PRAGMA {name}")
+            values[name] = cursor.fetchone()[0]
+    return values
@@ -0,0 +1,130 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views.decorators.http import require_GET
+
+from finance.models import FixedExpense, Income, LedgerEntry, Saving, VariableExpense
+from finance.routers import read_alias
+from finance.search import filter_ledger_search, filter_search
+
+EXPORT_MODULES = {
+    "income": Income,
+    "fixed": FixedExpense,
+    "variable": VariableExpense,
+    "saving": Saving,
+}
+COMMON_COLUMNS = [
+    ("fecha", "date"),
+    ("monto", "amount"),
+    ("descripcion", "description"),
+    ("categoria", "category__name"),
+    ("metodo_pago", "payment_method__name"),
+    ("notas", "notes"),
+]
+EXPORT_COLUMNS = {
+    Income: [*COMMON_COLUMNS, ("fuente", "source")],
+    FixedExpense: [*COMMON_COLUMNS, ("pagado", "is_paid"), ("dia_vencimiento", "due_day")],
+    VariableExpense: [*COMMON_COLUMNS, ("tipo_gasto", "expense_type")],
+    Saving: [*COMMON_COLUMNS, ("tipo_ahorro", "saving_type"), ("meta", "goal_name")],
+}
+LEDGER_COLUMNS = [("tipo", "kind"), *COMMON_COLUMNS]
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def _export_filters(request) -> dict:
+    filters = {}
+    for param, lookup in (("date_from", "date__gte"), ("date_to", "date__lte")):
+        value = request.GET.get(param)
+        if not value:
+            continue
+        try:
+            date = parse_date(value)
+        except ValueError:
+            date = None
+        if date is None:
+            raise Http404("Fecha inválida.")
+        filters[lookup] = date
+    category = request.GET.get("category")
+    if category:
+        if not category.isdigit():
+            raise Http404("Categoría inválida.")
+        filters["category_id"] = int(category)
+    return filters
+
+
+def transaction_rows(model, user, query=None, **filters):
+    queryset = filter_search(model.objects.filter(user=user, **filters), user, query)
+    fields = [field for _, field in EXPORT_COLUMNS[model]]
+    return queryset.values_list(*fields)
+
+
+def ledger_rows(user, query=None, **filters):
+    queryset = filter_ledger_search(LedgerEntry.objects.filter(user=user, **filters), user, query)
+    return queryset.values_list(*[field for _, field in LEDGER_COLUMNS])
+
+
+def stream_csv(headers, rows):
+    writer = csv.writer(Echo())
+    yield "\ufeff" + writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(headers, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+async def iterate_async(lines, chunk_size: int):
+    next_chunk = sync_to_async(lambda: "".join(islice(lines, chunk_size)))
+    while chunk := await next_chunk():
+        yield chunk
+
+
+@login_required
+@require_GET
+def export_transactions(request, module):
+    file_format = request.GET.get("format", "csv")
+    if file_format not in EXPORT_FORMATS:
+        raise Http404("Formato desconocido.")
+    filters = _export_filters(request)
+    query = request.GET.get("q")
+    if module == "ledger":
+        columns = LEDGER_COLUMNS
+        rows = ledger_rows(request.user, query, **filters)
+    elif module in EXPORT_MODULES:
+        columns = EXPORT_COLUMNS[EXPORT_MODULES[module]]
+        rows = transaction_rows(EXPORT_MODULES[module], request.user, query, **filters)
+    else:
+        raise Http404("Módulo desconocido.")
+    alias = read_alias(replica=True)
+    if alias:
+        rows = rows.using(alias)
+    headers = [header for header, _ in columns]
+    chunk_size = getattr(settings, "FINANCE_EXPORT_CHUNK_SIZE", 2000)
+    stream = stream_csv if file_format == "csv" else stream_ndjson
+    lines = stream(headers, rows.iterator(chunk_size=chunk_size))
+    if isinstance(request, ASGIRequest):
+        lines = iterate_async(lines, chunk_size)
+    response = StreamingHttpResponse(lines, content_type=EXPORT_FORMATS[file_format])
+    filename = f"{module}-{timezone.localdate().isoformat()}.{file_format}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -1,7 +1,21 @@
 from django import forms
 from django.contrib.auth.forms import AuthenticationForm
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
 
-from finance.models import Category, FixedExpense, Income, PaymentMethod, Saving, SavingGoal, VariableExpense
+from finance.choices import CATEGORY_FIELDS, GOAL_FIELDS, PAYMENT_METHOD_FIELDS, category_rows, get_form_choices
+from finance.importers import IMPORT_FORMATS, IMPORT_MODELS
+from finance.models import (
+    Category,
+    CategoryBudget,
+    FixedExpense,
+    Income,
+    PaymentMethod,
+    RecurringFixedExpense,
+    Saving,
+    SavingGoal,
+    VariableExpense,
+)
 
 
 class BootstrapAuthenticationForm(AuthenticationForm):
@@ -16,13 +30,65 @@ class BootstrapAuthenticationForm(AuthenticationForm):
             self.fields["password"].widget.attrs.setdefault("placeholder", "Tu contraseña")
 
 
-class BaseTransactionForm(forms.ModelForm):
+class CachedModelChoiceField(forms.ChoiceField):
+    def __init__(self, *, model, field_names, **kwargs):
+        self.model = model
+        self.field_names = field_names
+        self.rows = {}
+        super().__init__(choices=[("", "---------")], **kwargs)
+
+    def set_rows(self, rows) -> None:
+        label_index = self.field_names.index("name")
+        self.rows = {str(row[0]): row for row in rows}
+        self.choices = [("", "---------"), *((row[0], row[label_index]) for row in rows)]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.rows
+
+    def prepare_value(self, value):
+        return getattr(value, "pk", value)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        row = self.rows.get(str(getattr(value, "pk", value)))
+        if row is None:
+            raise ValidationError(self.error_messages["invalid_choice"], code="invalid_choice", params={"value": value})
+        return self.model.from_db(DEFAULT_DB_ALIAS, self.field_names, row)
+
+    def validate(self, value):
+        forms.Field.validate(self, value)
+        if value is None:
+            return
+        lookup = {field: getattr(value, field) for field in self.field_names if field in ("user_id", "kind")}
+        rows = self.model._base_manager.using(DEFAULT_DB_ALIAS).filter(pk=value.pk, is_active=True, **lookup)
+        if not rows.exists():
+            raise ValidationError(self.error_messages["invalid_choice"], code="invalid_choice", params={"value": value.pk})
+
+    def has_changed(self, initial, data):
+        return str(self.prepare_value(initial) or "") != str(data or "")
+
+
+class CachedChoicesModelForm(forms.ModelForm):
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        exclude.update(name for name, field in self.fields.items() if isinstance(field, CachedModelChoiceField))
+        return exclude
+
+
+class BaseTransactionForm(CachedChoicesModelForm):
     date = forms.DateField(widget=forms.DateInput(attrs={"type": "date", "class": "form-control"}))
     description = forms.CharField(widget=forms.TextInput(attrs={"class": "form-control"}))
     amount = forms.DecimalField(widget=forms.NumberInput(attrs={"class": "form-control", "step": "0.01"}))
-    category = forms.ModelChoiceField(queryset=Category.objects.none(), widget=forms.Select(attrs={"class": "form-select"}))
-    payment_method = forms.ModelChoiceField(
-        queryset=PaymentMethod.objects.none(),
+    category = CachedModelChoiceField(
+        model=Category,
+        field_names=CATEGORY_FIELDS,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    payment_method = CachedModelChoiceField(
+        model=PaymentMethod,
+        field_names=PAYMENT_METHOD_FIELDS,
         widget=forms.Select(attrs={"class": "form-select"}),
     )
     notes = forms.CharField(
@@ -32,12 +98,11 @@ class BaseTransactionForm(forms.ModelForm):
 
     def __init__(self, *args, user=None, category_kind=None, **kwargs):
         super().__init__(*args, **kwargs)
+        self.choice_data = None
         if user is not None:
-            category_qs = Category.objects.filter(user=user, is_active=True)
-            if category_kind:
-                category_qs = category_qs.filter(kind=category_kind)
-            self.fields["category"].queryset = category_qs
-            self.fields["payment_method"].queryset = PaymentMethod.objects.filter(user=user, is_active=True)
+            self.choice_data = get_form_choices(user)
+            self.fields["category"].set_rows(category_rows(self.choice_data, category_kind))
+            self.fields["payment_method"].set_rows(self.choice_data["payment_methods"])
 
 
 class IncomeForm(BaseTransactionForm):
@@ -77,6 +142,104 @@ class FixedExpenseForm(BaseTransactionForm):
         ]
 
 
+class RecurringFixedExpenseForm(CachedChoicesModelForm):
+    description = forms.CharField(label="Descripción", widget=forms.TextInput(attrs={"class": "form-control"}))
+    amount = forms.DecimalField(label="Monto", widget=forms.NumberInput(attrs={"class": "form-control", "step": "0.01"}))
+    category = CachedModelChoiceField(
+        label="Categoría",
+        model=Category,
+        field_names=CATEGORY_FIELDS,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    payment_method = CachedModelChoiceField(
+        label="Método de pago",
+        model=PaymentMethod,
+        field_names=PAYMENT_METHOD_FIELDS,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    due_day = forms.IntegerField(
+        label="Día de vencimiento",
+        min_value=1,
+        max_value=31,
+        help_text="En los meses más cortos se usa el último día del mes.",
+        widget=forms.NumberInput(attrs={"class": "form-control", "min": 1, "max": 31}),
+    )
+    notes = forms.CharField(
+        label="Notas",
+        required=False,
+        widget=forms.Textarea(attrs={"class": "form-control", "rows": 3}),
+    )
+    is_active = forms.BooleanField(
+        label="Activo",
+        required=False,
+        initial=True,
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+
+    def __init__(self, *args, user=None, category_kind=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.choice_data = None
+        if user is not None:
+            self.choice_data = get_form_choices(user)
+            self.fields["category"].set_rows(category_rows(self.choice_data, Category.KIND_FIXED))
+            self.fields["payment_method"].set_rows(self.choice_data["payment_methods"])
+
+    class Meta:
+        model = RecurringFixedExpense
+        fields = [
+            "description",
+            "amount",
+            "category",
+            "payment_method",
+            "due_day",
+            "notes",
+            "is_active",
+        ]
+
+
+class CategoryBudgetForm(CachedChoicesModelForm):
+    category = CachedModelChoiceField(
+        label="Categoría",
+        model=Category,
+        field_names=CATEGORY_FIELDS,
+        help_text="Solo categorías de gastos fijos y variables.",
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    amount = forms.DecimalField(
+        label="Presupuesto mensual",
+        min_value=0,
+        widget=forms.NumberInput(attrs={"class": "form-control", "step": "0.01"}),
+    )
+    is_active = forms.BooleanField(
+        label="Activo",
+        required=False,
+        initial=True,
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+
+    def __init__(self, *args, user=None, category_kind=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.choice_data = None
+        if user is not None:
+            self.choice_data = get_form_choices(user)
+            self.fields["category"].set_rows(
+                [
+                    *category_rows(self.choice_data, Category.KIND_FIXED),
+                    *category_rows(self.choice_data, Category.KIND_VARIABLE),
+                ]
+            )
+
+    def clean_category(self):
+        category = self.cleaned_data["category"]
+        if CategoryBudget.objects.filter(category_id=category.pk).exclude(pk=self.instance.pk).exists():
+            raise ValidationError("Esta categoría ya tiene un presupuesto.")
+        return category
+
+    class Meta:
+        model = CategoryBudget
+        fields = ["category", "amount", "is_active"]
+
+
 class VariableExpenseForm(BaseTransactionForm):
     expense_type = forms.ChoiceField(
         choices=VariableExpense.TYPE_CHOICES,
@@ -101,8 +264,9 @@ class SavingForm(BaseTransactionForm):
         choices=Saving.SAVING_TYPE_CHOICES,
         widget=forms.Select(attrs={"class": "form-select"}),
     )
-    goal = forms.ModelChoiceField(
-        queryset=SavingGoal.objects.none(),
+    goal = CachedModelChoiceField(
+        model=SavingGoal,
+        field_names=GOAL_FIELDS,
         required=False,
         label="Meta",
         widget=forms.Select(attrs={"class": "form-select"}),
@@ -111,8 +275,8 @@ class SavingForm(BaseTransactionForm):
     def __init__(self, *args, user=None, **kwargs):
         kwargs.pop("category_kind", None)
         super().__init__(*args, user=user, category_kind=Category.KIND_SAVING, **kwargs)
-        if user is not None:
-            self.fields["goal"].queryset = SavingGoal.objects.filter(user=user, is_active=True)
+        if self.choice_data is not None:
+            self.fields["goal"].set_rows(self.choice_data["goals"])
 
     def save(self, commit=True):
         instance = super().save(commit=False)
@@ -168,3 +332,128 @@ class SavingGoalForm(forms.ModelForm):
     class Meta:
         model = SavingGoal
         fields = ["name", "target_amount", "is_active"]
+
+
+class TransactionImportForm(forms.Form):
+    MODULE_CHOICES = [
+        ("income", "Ingresos"),
+        ("fixed", "Gastos fijos"),
+        ("variable", "Gastos variables"),
+        ("saving", "Ahorros"),
+    ]
+
+    module = forms.ChoiceField(label="Módulo", choices=MODULE_CHOICES, widget=forms.Select(attrs={"class": "form-select"}))
+    file_format = forms.ChoiceField(
+        label="Formato",
+        choices=IMPORT_FORMATS,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    file = forms.FileField(label="Archivo", widget=forms.ClearableFileInput(attrs={"class": "form-control"}))
+    default_category = CachedModelChoiceField(
+        label="Categoría por defecto",
+        model=Category,
+        field_names=CATEGORY_FIELDS,
+        required=False,
+        help_text="Se usa en las filas sin categoría y en los archivos OFX.",
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    default_payment_method = CachedModelChoiceField(
+        label="Método de pago por defecto",
+        model=PaymentMethod,
+        field_names=PAYMENT_METHOD_FIELDS,
+        required=False,
+        help_text="Se usa en las filas sin método de pago y en los archivos OFX.",
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if user is not None:
+            choices = get_form_choices(user)
+            self.fields["default_category"].set_rows(category_rows(choices))
+            self.fields["default_payment_method"].set_rows(choices["payment_methods"])
+
+    def clean(self):
+        cleaned_data = super().clean()
+        category = cleaned_data.get("default_category")
+        model = IMPORT_MODELS.get(cleaned_data.get("module"))
+        if category and model and category.kind != model.CATEGORY_KIND:
+            self.add_error("default_category", "La categoría no corresponde al módulo seleccionado.")
+        return cleaned_data
+
+
+class TransactionBulkActionForm(forms.Form):
+    ACTION_DELETE = "delete"
+    ACTION_CATEGORY = "category"
+    ACTION_PAYMENT_METHOD = "payment_method"
+    ACTION_MARK_PAID = "mark_paid"
+    ACTION_MARK_UNPAID = "mark_unpaid"
+    ACTION_CHOICES = [
+        (ACTION_DELETE, "Eliminar"),
+        (ACTION_CATEGORY, "Cambiar categoría"),
+        (ACTION_PAYMENT_METHOD, "Cambiar método de pago"),
+        (ACTION_MARK_PAID, "Marcar como pagados"),
+        (ACTION_MARK_UNPAID, "Marcar como no pagados"),
+    ]
+    PAID_ACTIONS = {ACTION_MARK_PAID: True, ACTION_MARK_UNPAID: False}
+
+    action = forms.ChoiceField(label="Acción", widget=forms.Select(attrs={"class": "form-select"}))
+    ids = forms.Field(required=False, widget=forms.MultipleHiddenInput)
+    select_all = forms.BooleanField(
+        label="Aplicar a todos los resultados",
+        required=False,
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+    q = forms.CharField(required=False, widget=forms.HiddenInput)
+    category = CachedModelChoiceField(
+        label="Categoría",
+        model=Category,
+        field_names=CATEGORY_FIELDS,
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    payment_method = CachedModelChoiceField(
+        label="Método de pago",
+        model=PaymentMethod,
+        field_names=PAYMENT_METHOD_FIELDS,
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+
+    def __init__(self, *args, user=None, model=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.model = model
+        self.fields["action"].choices = [
+            (value, label)
+            for value, label in self.ACTION_CHOICES
+            if value not in self.PAID_ACTIONS or model is FixedExpense
+        ]
+        if user is not None:
+            choices = get_form_choices(user)
+            self.fields["category"].set_rows(category_rows(choices, model.CATEGORY_KIND if model else None))
+            self.fields["payment_method"].set_rows(choices["payment_methods"])
+
+    def clean_ids(self):
+        try:
+            return [int(value) for value in self.cleaned_data["ids"] or []]
+        except (TypeError, ValueError):
+            raise ValidationError("Selección inválida.")
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+        if not cleaned_data.get("select_all") and not cleaned_data.get("ids"):
+            raise ValidationError("Selecciona al menos un registro.")
+        if action == self.ACTION_CATEGORY and not cleaned_data.get("category"):
+            self.add_error("category", "Elige la nueva categoría.")
+        if action == self.ACTION_PAYMENT_METHOD and not cleaned_data.get("payment_method"):
+            self.add_error("payment_method", "Elige el nuevo método de pago.")
+        return cleaned_data
+
+    def changes(self) -> dict:
+        action = self.cleaned_data["action"]
+        if action == self.ACTION_CATEGORY:
+            return {"category_id": self.cleaned_data["category"].pk}
+        if action == self.ACTION_PAYMENT_METHOD:
+            return {"payment_method_id": self.cleaned_data["payment_method"].pk}
+        return {"is_paid": self.PAID_ACTIONS[action]}
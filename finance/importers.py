@@ -0,0 +1,301 @@
+import codecs
+import csv
+import datetime
+import io
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+
+from finance.bulk import bulk_create_transactions
+from finance.models import Category, FixedExpense, Income, PaymentMethod, Saving, SavingGoal, VariableExpense
+
+IMPORT_MODELS = {
+    "income": Income,
+    "fixed": FixedExpense,
+    "variable": VariableExpense,
+    "saving": Saving,
+}
+IMPORT_FORMATS = [
+    ("csv", "CSV"),
+    ("ofx", "OFX"),
+]
+MAX_REPORTED_ERRORS = 200
+OFX_CHUNK_SIZE = 64 * 1024
+ENCODING_SAMPLE_SIZE = 64 * 1024
+FALLBACK_ENCODING = "cp1252"
+REQUIRED_CSV_COLUMNS = {"date": "fecha", "amount": "monto"}
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+MAX_AMOUNT = Decimal("10") ** 10
+DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"]
+CSV_COLUMNS = {
+    "date": ["date", "fecha"],
+    "amount": ["amount", "monto", "importe", "valor"],
+    "description": ["description", "descripcion", "descripción", "concepto"],
+    "category": ["category", "categoria", "categoría"],
+    "payment_method": ["payment_method", "metodo_pago", "método_pago", "metodo", "método"],
+    "notes": ["notes", "notas"],
+    "source": ["source", "fuente"],
+    "is_paid": ["is_paid", "pagado"],
+    "due_day": ["due_day", "dia_vencimiento", "día_vencimiento"],
+    "expense_type": ["expense_type", "tipo_gasto", "tipo"],
+    "saving_type": ["saving_type", "tipo_ahorro", "tipo"],
+    "goal": ["goal", "meta"],
+}
+TRUE_VALUES = {"1", "si", "sí", "true", "yes", "x"}
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def _lookup(rows) -> dict:
+    return {name.strip().casefold(): pk for pk, name in rows}
+
+
+def parse_amount(value: str) -> Decimal:
+    cleaned = re.sub(r"[\s$€]", "", value or "")
+    if "," in cleaned and "." in cleaned:
+        decimal_mark = "," if cleaned.rfind(",") > cleaned.rfind(".") else "."
+        thousands_mark = "." if decimal_mark == "," else ","
+        cleaned = cleaned.replace(thousands_mark, "").replace(decimal_mark, ".")
+    elif "," in cleaned:
+        cleaned = cleaned.replace(",", ".")
+    try:
+        amount = abs(Decimal(cleaned)).quantize(Decimal("0.01"))
+    except InvalidOperation as exc:
+        raise ValueError(f"Monto inválido: {value!r}.") from exc
+    if not amount or amount >= MAX_AMOUNT:
+        raise ValueError(f"Monto fuera de rango: {value!r}.")
+    return amount
+
+
+def parse_date(value: str) -> datetime.date:
+    value = (value or "").strip()
+    if value[:8].isdigit():
+        value, patterns = value[:8], ["%Y%m%d"]
+    else:
+        patterns = DATE_FORMATS
+    for pattern in patterns:
+        try:
+            return datetime.datetime.strptime(value, pattern).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Fecha inválida: {value!r}.")
+
+
+def detect_encoding(stream) -> str:
+    sample = stream.read(ENCODING_SAMPLE_SIZE)
+    stream.seek(0)
+    try:
+        codecs.getincrementaldecoder("utf-8-sig")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+    return "utf-8-sig"
+
+
+def read_csv(stream):
+    reader = csv.reader(stream)
+    try:
+        header = next(reader, None)
+        if header is None:
+            return
+        positions = {name.strip().casefold(): index for index, name in enumerate(header)}
+        columns = {}
+        for field, aliases in CSV_COLUMNS.items():
+            for alias in aliases:
+                if alias in positions:
+                    columns[field] = positions[alias]
+                    break
+        missing = [label for field, label in REQUIRED_CSV_COLUMNS.items() if field not in columns]
+        if missing:
+            raise ValueError(f"El archivo CSV no tiene columna de {' ni de '.join(missing)}.")
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            yield reader.line_num, {
+                field: row[index].strip() if index < len(row) else "" for field, index in columns.items()
+            }
+    except csv.Error as exc:
+        raise ValueError(f"El archivo CSV no es válido en la línea {reader.line_num}: {exc}.") from exc
+    except UnicodeDecodeError as exc:
+        raise ValueError(f"El archivo CSV tiene caracteres inválidos para {exc.encoding}.") from exc
+
+
+def read_ofx(stream):
+    buffer = ""
+    record = None
+    line = 0
+    while True:
+        try:
+            chunk = stream.read(OFX_CHUNK_SIZE)
+        except UnicodeDecodeError as exc:
+            raise ValueError(f"El archivo OFX tiene caracteres inválidos para {exc.encoding}.") from exc
+        buffer += chunk
+        end = len(buffer) if not chunk else buffer.rfind("<")
+        consumed = 0
+        for match in OFX_TAG.finditer(buffer, 0, max(end, 0)):
+            closing, tag, value = match.groups()
+            tag = tag.upper()
+            consumed = match.end()
+            if tag == "STMTTRN":
+                if closing and record is not None:
+                    yield line, record
+                    record = None
+                elif not closing:
+                    line += 1
+                    record = {}
+            elif record is not None and not closing and value.strip():
+                record[tag] = value.strip()
+        buffer = buffer[consumed:]
+        if not chunk:
+            break
+    if record:
+        yield line, record
+
+
+def ofx_record(record: dict) -> dict:
+    name = record.get("NAME", "")
+    memo = record.get("MEMO", "")
+    return {
+        "date": record.get("DTPOSTED", ""),
+        "amount": record.get("TRNAMT", ""),
+        "description": name or memo,
+        "notes": memo if name else "",
+        "source": name or memo,
+    }
+
+
+class TransactionImporter:
+    def __init__(self, user, model, batch_size=None, default_category=None, default_payment_method=None):
+        self.user = user
+        self.model = model
+        self.batch_size = batch_size or getattr(settings, "FINANCE_IMPORT_BATCH_SIZE", 1000)
+        self.categories = _lookup(
+            Category.objects.filter(user=user, kind=model.CATEGORY_KIND, is_active=True).values_list("pk", "name")
+        )
+        self.payment_methods = _lookup(PaymentMethod.objects.filter(user=user, is_active=True).values_list("pk", "name"))
+        self.goals = {}
+        if model is Saving:
+            self.goals = {
+                name.strip().casefold(): (pk, name, target_amount)
+                for pk, name, target_amount in SavingGoal.objects.filter(user=user, is_active=True).values_list(
+                    "pk", "name", "target_amount"
+                )
+            }
+        self.default_category_id = None
+        self.default_payment_method_id = None
+        if default_category:
+            self.default_category_id = self._resolve(self.categories, default_category, "la categoría")
+        if default_payment_method:
+            self.default_payment_method_id = self._resolve(self.payment_methods, default_payment_method, "el método de pago")
+
+    def _resolve(self, lookup: dict, name: str, label: str):
+        try:
+            return lookup[name.strip().casefold()]
+        except KeyError as exc:
+            raise ValueError(f"No se encontró {label} {name!r}.") from exc
+
+    def build(self, record: dict):
+        description = record.get("description", "")
+        if not description:
+            raise ValueError("La descripción es obligatoria.")
+        if len(description) > 255:
+            raise ValueError("La descripción supera los 255 caracteres.")
+        category_name = record.get("category", "")
+        payment_method_name = record.get("payment_method", "")
+        if category_name:
+            category_id = self._resolve(self.categories, category_name, "la categoría")
+        elif self.default_category_id:
+            category_id = self.default_category_id
+        else:
+            raise ValueError("La categoría es obligatoria.")
+        if payment_method_name:
+            payment_method_id = self._resolve(self.payment_methods, payment_method_name, "el método de pago")
+        elif self.default_payment_method_id:
+            payment_method_id = self.default_payment_method_id
+        else:
+            raise ValueError("El método de pago es obligatorio.")
+        values = {
+            "user_id": self.user.pk,
+            "date": parse_date(record.get("date", "")),
+            "amount": parse_amount(record.get("amount", "")),
+            "description": description,
+            "category_id": category_id,
+            "payment_method_id": payment_method_id,
+            "notes": record.get("notes", ""),
+        }
+        values.update(getattr(self, f"_build_{self.model._meta.model_name}")(record))
+        return self.model(**values)
+
+    def _build_income(self, record: dict) -> dict:
+        source = record.get("source", "")
+        if not source:
+            raise ValueError("La fuente es obligatoria.")
+        return {"source": source[:100]}
+
+    def _build_fixedexpense(self, record: dict) -> dict:
+        due_day = record.get("due_day", "")
+        if due_day and (not due_day.isdigit() or not 1 <= int(due_day) <= 31):
+            raise ValueError(f"Día de vencimiento inválido: {due_day!r}.")
+        return {
+            "is_paid": record.get("is_paid", "").casefold() in TRUE_VALUES,
+            "due_day": int(due_day) if due_day else None,
+        }
+
+    def _build_variableexpense(self, record: dict) -> dict:
+        expense_type = (record.get("expense_type") or VariableExpense.TYPE_NECESSARY).upper()
+        if expense_type not in dict(VariableExpense.TYPE_CHOICES):
+            raise ValueError(f"Tipo de gasto inválido: {expense_type!r}.")
+        return {"expense_type": expense_type}
+
+    def _build_saving(self, record: dict) -> dict:
+        saving_type = (record.get("saving_type") or Saving.SAVING_TYPE_AHORRO).upper()
+        if saving_type not in dict(Saving.SAVING_TYPE_CHOICES):
+            raise ValueError(f"Tipo de ahorro inválido: {saving_type!r}.")
+        values = {"saving_type": saving_type, "goal_id": None, "goal_name": "", "goal_amount": None}
+        if record.get("goal"):
+            goal_id, goal_name, target_amount = self._resolve(self.goals, record["goal"], "la meta")
+            values.update(goal_id=goal_id, goal_name=goal_name, goal_amount=target_amount)
+        return values
+
+    def run(self, records) -> ImportResult:
+        result = ImportResult()
+        batch = []
+        try:
+            for line, record in records:
+                try:
+                    batch.append(self.build(record))
+                except ValueError as exc:
+                    result.add_error(line, str(exc))
+                    continue
+                if len(batch) >= self.batch_size:
+                    bulk_create_transactions(self.model, batch)
+                    result.created += len(batch)
+                    batch = []
+        except ValueError as exc:
+            if not result.created:
+                raise
+            raise ValueError(f"{exc} Se importaron {result.created} registros antes del error.") from exc
+        if batch:
+            bulk_create_transactions(self.model, batch)
+            result.created += len(batch)
+        return result
+
+
+def import_transactions(user, model, stream, file_format: str = "csv", **options) -> ImportResult:
+    stream = io.TextIOWrapper(stream, encoding=detect_encoding(stream), newline="")
+    importer = TransactionImporter(user, model, **options)
+    if file_format == "ofx":
+        records = ((line, ofx_record(record)) for line, record in read_ofx(stream))
+    else:
+        records = read_csv(stream)
+    return importer.run(records)
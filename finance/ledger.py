@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+
+from finance.models import LedgerEntry
+from finance.rollups import CENT, TRANSACTION_MODELS
+
+LEDGER_FIELDS = ("user_id", "date", "amount", "category_id", "payment_method_id", "description", "notes")
+LEDGER_BATCH_SIZE = 1000
+
+
+def _entry_values(instance) -> dict:
+    return {field: getattr(instance, field) for field in LEDGER_FIELDS}
+
+
+def ledger_entry(model, instance) -> LedgerEntry:
+    return LedgerEntry(kind=model.CATEGORY_KIND, source_id=instance.pk, **_entry_values(instance))
+
+
+def add_ledger_entries(model, instances) -> None:
+    LedgerEntry.objects.bulk_create([ledger_entry(model, instance) for instance in instances], batch_size=LEDGER_BATCH_SIZE)
+
+
+def sync_ledger_entry(model, instance, created: bool = False) -> None:
+    if not created:
+        entries = LedgerEntry.objects.filter(kind=model.CATEGORY_KIND, source_id=instance.pk)
+        if entries.update(**_entry_values(instance)):
+            return
+    ledger_entry(model, instance).save(force_insert=True)
+
+
+def remove_ledger_entries(model, pks) -> None:
+    LedgerEntry.objects.filter(kind=model.CATEGORY_KIND, source_id__in=list(pks)).delete()
+
+
+def _insert_from_source_sql(model) -> str:
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(LedgerEntry._meta.get_field(field).column) for field in LEDGER_FIELDS)
+    source_columns = ", ".join(quote(model._meta.get_field(field).column) for field in LEDGER_FIELDS)
+    return (
+        f"INSERT INTO {quote(LedgerEntry._meta.db_table)} ({quote('kind')}, {quote('source_id')}, {columns}) "
+        f"SELECT %s, {quote(model._meta.pk.column)}, {source_columns} FROM {quote(model._meta.db_table)} "
+        f"WHERE {quote(model._meta.get_field('user_id').column)} = %s"
+    )
+
+
+@transaction.atomic
+def rebuild_user_ledger(user_id) -> int:
+    LedgerEntry.objects.filter(user_id=user_id).delete()
+    created = 0
+    with connection.cursor() as cursor:
+        for model in TRANSACTION_MODELS:
+            cursor.execute(_insert_from_source_sql(model), [model.CATEGORY_KIND, user_id])
+            created += cursor.rowcount
+    return created
+
+
+def diff_user_ledger(user_id) -> dict:
+    stored = {
+        row["kind"]: (row["count"], row["total"])
+        for row in LedgerEntry.objects.filter(user_id=user_id)
+        .order_by()
+        .values("kind")
+        .annotate(count=Count("id"), total=Sum("amount"))
+    }
+    mismatches = {}
+    for model in TRANSACTION_MODELS:
+        totals = model.objects.filter(user_id=user_id).aggregate(count=Count("id"), total=Sum("amount"))
+        expected = (totals["count"], (totals["total"] or Decimal("0")).quantize(CENT))
+        count, total = stored.get(model.CATEGORY_KIND, (0, Decimal("0")))
+        if expected != (count, (total or Decimal("0")).quantize(CENT)):
+            mismatches[model.CATEGORY_KIND] = {"expected": expected, "stored": (count, total)}
+    return mismatches
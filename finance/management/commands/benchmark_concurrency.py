@@ -0,0 +1,45 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.benchmarks import run_concurrency_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta en paralelo hilos que registran gastos e hilos que leen los dashboards, cada uno con su propia "
+        "conexión, e informa en JSON el rendimiento, la latencia y los errores de bloqueo de la base de datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", default="demo1", help="Nombre del usuario a usar.")
+        parser.add_argument("--writers", type=int, default=4, help="Hilos que registran gastos.")
+        parser.add_argument("--readers", type=int, default=4, help="Hilos que consultan los dashboards.")
+        parser.add_argument("--duration", type=float, default=10.0, help="Duración en segundos.")
+        parser.add_argument("--keep", action="store_true", help="Conserva los gastos creados por el benchmark.")
+        parser.add_argument("--output", help="Archivo donde guardar el JSON en lugar de la salida estándar.")
+
+    def handle(self, *args, user, writers, readers, duration, keep=False, output=None, **options):
+        try:
+            user = get_user_model().objects.get_by_natural_key(user)
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"No existe el usuario {user!r}; usa seed_demo_data para crearlo.") from exc
+        if writers < 0 or readers < 0 or writers + readers == 0:
+            raise CommandError("Se necesita al menos un hilo de escritura o de lectura.")
+        if duration <= 0:
+            raise CommandError("--duration debe ser mayor que cero.")
+        try:
+            report = run_concurrency_benchmark(user, writers=writers, readers=readers, duration=duration, keep=keep)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        content = json.dumps(report, indent=2)
+        if output:
+            with open(output, "w", encoding="utf-8") as handle:
+                handle.write(content + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {output}."))
+        else:
+            self.stdout.write(content)
+        errors = report["writes"]["errors"] + report["reads"]["errors"]
+        if errors:
+            raise CommandError(f"{errors} operaciones fallaron por bloqueos de la base de datos.")
@@ -0,0 +1,37 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.benchmarks import run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide tiempo, número de consultas y memoria máxima (percentiles) de los dashboards y listados "
+        "a través del cliente de pruebas y los imprime en JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", default="demo1", help="Nombre del usuario a medir.")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--cold", action="store_true", help="Invalida la caché antes de cada petición.")
+        parser.add_argument("--label", default="", help="Etiqueta para identificar la ejecución (por ejemplo, el commit).")
+        parser.add_argument("--output", help="Archivo donde guardar el JSON en lugar de la salida estándar.")
+
+    def handle(self, *args, user, iterations, warmup, cold=False, label="", output=None, **options):
+        try:
+            user = get_user_model().objects.get_by_natural_key(user)
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"No existe el usuario {user!r}; usa seed_demo_data para crearlo.") from exc
+        if iterations < 1:
+            raise CommandError("--iterations debe ser mayor que cero.")
+        report = {"label": label, **run_benchmark(user, iterations=iterations, warmup=warmup, cold=cold)}
+        content = json.dumps(report, indent=2)
+        if output:
+            with open(output, "w", encoding="utf-8") as handle:
+                handle.write(content + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {output}."))
+        else:
+            self.stdout.write(content)
@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from finance.query_plans import find_full_scans
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta EXPLAIN sobre las consultas de los servicios y falla si alguna recorre una tabla completa."
+    )
+
+    def add_arguments(self, parser):
+        today = timezone.localdate()
+        parser.add_argument("--user", type=int, dest="user_id", help="ID de usuario (por defecto el primero).")
+        parser.add_argument("--year", type=int, default=today.year)
+        parser.add_argument("--month", type=int, default=today.month)
+
+    def handle(self, *args, user_id=None, year=None, month=None, **options):
+        User = get_user_model()
+        users = User.objects.order_by("pk")
+        user = users.filter(pk=user_id).first() if user_id else users.first()
+        if user is None:
+            raise CommandError(f"No existe el usuario {user_id}." if user_id else "No hay usuarios; crea uno o usa seed_demo_data.")
+        try:
+            problems = find_full_scans(user, year, month)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        for problem in problems:
+            self.stderr.write(f"{problem['label']}:\n  {problem['sql']}")
+            for line in problem["plan"]:
+                self.stderr.write(f"    {line}")
+        if problems:
+            raise CommandError(f"{len(problems)} consulta(s) sin índice.")
+        self.stdout.write(self.style.SUCCESS("Todas las consultas de los servicios usan índices."))
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.importers import IMPORT_FORMATS, IMPORT_MODELS, import_transactions
+
+
+class Command(BaseCommand):
+    help = "Importa movimientos desde un archivo CSV u OFX en lotes, informando los errores por fila."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Ruta del archivo a importar.")
+        parser.add_argument("--user", type=int, dest="user_id", required=True, help="ID del usuario dueño de los movimientos.")
+        parser.add_argument("--module", choices=sorted(IMPORT_MODELS), required=True)
+        parser.add_argument("--format", choices=[value for value, _ in IMPORT_FORMATS], default="csv", dest="file_format")
+        parser.add_argument("--batch-size", type=int, help="Filas por transacción (por defecto FINANCE_IMPORT_BATCH_SIZE).")
+        parser.add_argument("--category", help="Nombre de la categoría para filas sin categoría.")
+        parser.add_argument("--payment-method", help="Nombre del método de pago para filas sin método.")
+
+    def handle(self, *args, path, user_id, module, file_format, batch_size=None, category=None, payment_method=None, **options):
+        try:
+            user = get_user_model().objects.get(pk=user_id)
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"No existe el usuario {user_id}.") from exc
+        try:
+            with open(path, "rb") as stream:
+                result = import_transactions(
+                    user,
+                    IMPORT_MODELS[module],
+                    stream,
+                    file_format,
+                    batch_size=batch_size,
+                    default_category=category,
+                    default_payment_method=payment_method,
+                )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+        for line, message in result.errors:
+            self.stderr.write(f"Fila {line}: {message}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... y {result.error_count - len(result.errors)} errores más.")
+        self.stdout.write(self.style.SUCCESS(f"{result.created} registros importados, {result.error_count} con errores."))
@@ -0,0 +1,34 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from finance.recurring import materialize_month, next_month
+
+MONTH_PATTERN = re.compile(r"^(\d{4})-(\d{2})$")
+
+
+class Command(BaseCommand):
+    help = "Genera los gastos fijos del mes a partir de las plantillas recurrentes activas de todos los usuarios."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--month", help="Mes a generar en formato AAAA-MM (por defecto, el próximo mes).")
+        parser.add_argument("--user", action="append", type=int, dest="user_ids", help="ID de usuario (repetible).")
+        parser.add_argument("--batch-size", type=int, help="Gastos creados por lote.")
+        parser.add_argument("--dry-run", action="store_true", help="Solo cuenta los gastos pendientes, sin crearlos.")
+
+    def handle(self, *args, month=None, user_ids=None, batch_size=None, dry_run=False, **options):
+        if month:
+            match = MONTH_PATTERN.match(month)
+            if not match or not 1 <= int(match.group(2)) <= 12:
+                raise CommandError(f"Mes inválido: {month!r}. Usa el formato AAAA-MM.")
+            year, month = int(match.group(1)), int(match.group(2))
+        else:
+            year, month = next_month(timezone.localdate())
+        if batch_size is not None and batch_size < 1:
+            raise CommandError("--batch-size debe ser mayor que cero.")
+        count = materialize_month(year, month, user_ids=user_ids, batch_size=batch_size, dry_run=dry_run)
+        if dry_run:
+            self.stdout.write(f"{count} gastos fijos pendientes para {year}-{month:02d}.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{count} gastos fijos generados para {year}-{month:02d}."))
@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.ledger import diff_user_ledger, rebuild_user_ledger
+from finance.rollups import diff_goal_totals, diff_user_rollups, rebuild_goal_totals, rebuild_user_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye y verifica los totales mensuales, el total ahorrado por meta y el libro unificado de "
+        "movimientos a partir de las tablas de movimientos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", action="append", type=int, dest="user_ids", help="ID de usuario (repetible).")
+        parser.add_argument(
+            "--verify-only",
+            action="store_true",
+            help="Solo compara los totales guardados con los movimientos, sin reconstruir.",
+        )
+
+    def handle(self, *args, user_ids=None, verify_only=False, **options):
+        users = get_user_model().objects.order_by("pk")
+        if user_ids:
+            users = users.filter(pk__in=user_ids)
+        mismatched_users = 0
+        for user_id in users.values_list("pk", flat=True).iterator():
+            if not verify_only:
+                rows = rebuild_user_rollups(user_id)
+                goals = rebuild_goal_totals(user_id)
+                entries = rebuild_user_ledger(user_id)
+                self.stdout.write(
+                    f"Usuario {user_id}: {rows} totales mensuales, {goals} metas y {entries} asientos reconstruidos."
+                )
+            mismatches = diff_user_rollups(user_id)
+            goal_mismatches = diff_goal_totals(user_id)
+            ledger_mismatches = diff_user_ledger(user_id)
+            if mismatches or goal_mismatches or ledger_mismatches:
+                mismatched_users += 1
+            for (_, kind, year, month, category_id), values in sorted(mismatches.items()):
+                self.stderr.write(
+                    f"Usuario {user_id} {kind} {year}-{month:02d} categoría {category_id}: "
+                    f"esperado {values['expected']}, guardado {values['stored']}"
+                )
+            for goal_id, values in sorted(goal_mismatches.items()):
+                self.stderr.write(
+                    f"Usuario {user_id} meta {goal_id}: esperado {values['expected']}, guardado {values['stored']}"
+                )
+            for kind, values in sorted(ledger_mismatches.items()):
+                self.stderr.write(
+                    f"Usuario {user_id} libro {kind}: esperado {values['expected']}, guardado {values['stored']}"
+                )
+        if mismatched_users:
+            raise CommandError(f"{mismatched_users} usuario(s) con totales inconsistentes.")
+        self.stdout.write(self.style.SUCCESS("Totales verificados."))
@@ -0,0 +1,89 @@
+import os
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.caching import is_cache_shared
+from finance.recompute import default_workers, load_state, recompute_users, save_state, supports_parallel_writes
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula en paralelo los totales mensuales, el total ahorrado por meta y el libro unificado de todos "
+        "los usuarios, repartiendo los usuarios entre procesos con su propia conexión a la base de datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", nargs="+", type=int, dest="user_ids", help="IDs de usuario a recalcular.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help=(
+                "Procesos en paralelo (por defecto, uno por núcleo; uno solo en SQLite sin el perfil de producción, "
+                "que es el que espera los bloqueos de escritura)."
+            ),
+        )
+        parser.add_argument(
+            "--state",
+            help="Archivo JSON con los usuarios ya recalculados; permite retomar una ejecución interrumpida.",
+        )
+        parser.add_argument("--restart", action="store_true", help="Ignora el archivo de estado y empieza de cero.")
+        parser.add_argument("--verify", action="store_true", help="Compara los totales con los movimientos al terminar.")
+
+    def handle(self, *args, user_ids=None, workers=None, state=None, restart=False, verify=False, **options):
+        if workers is None:
+            workers = default_workers()
+        if workers < 1:
+            raise CommandError("--workers debe ser mayor que cero.")
+        if workers > 1 and not supports_parallel_writes():
+            self.stderr.write(
+                self.style.WARNING(
+                    "SQLite sin busy_timeout ni transacciones IMMEDIATE: los procesos pueden chocar con \"database is "
+                    "locked\"; los usuarios que fallen se reintentan al final de uno en uno."
+                )
+            )
+        users = get_user_model().objects.order_by("pk")
+        if user_ids:
+            users = users.filter(pk__in=user_ids)
+        if not is_cache_shared():
+            self.stderr.write(
+                self.style.WARNING(
+                    "La caché de dashboards está en memoria local: este comando no puede invalidarla en el servidor y "
+                    "los dashboards pueden mostrar datos anteriores hasta que expire FINANCE_CACHE_TIMEOUT. Usa una "
+                    "caché compartida (archivos, Redis o Memcached) para invalidarla al instante."
+                )
+            )
+        completed = load_state(state) if state and not restart else set()
+        pending = [user_id for user_id in users.values_list("pk", flat=True) if user_id not in completed]
+        total = len(pending)
+        self.stdout.write(f"{total} usuarios pendientes ({len(completed)} ya recalculados) con {workers} procesos.")
+        start = time.perf_counter()
+        failures = mismatches = 0
+        for done, result in enumerate(recompute_users(pending, workers, verify), start=1):
+            user_id = result["user_id"]
+            prefix = f"[{done}/{total}] Usuario {user_id}"
+            if "error" in result:
+                failures += 1
+                self.stderr.write(f"{prefix}: error {result['error']}")
+                continue
+            if result.get("mismatches"):
+                mismatches += 1
+                self.stderr.write(f"{prefix}: {result['mismatches']} diferencias tras recalcular")
+                continue
+            completed.add(user_id)
+            if state:
+                save_state(state, completed)
+            self.stdout.write(
+                f"{prefix}: {result['rollups']} totales mensuales, {result['goals']} metas y "
+                f"{result['entries']} asientos en {result['seconds']:.2f}s."
+            )
+        elapsed = time.perf_counter() - start
+        if failures or mismatches:
+            raise CommandError(
+                f"{failures} usuario(s) con error y {mismatches} con diferencias; vuelve a ejecutar con --state "
+                "para reintentarlos."
+            )
+        if state and os.path.exists(state):
+            os.remove(state)
+        self.stdout.write(self.style.SUCCESS(f"{total} usuarios recalculados en {elapsed:.1f}s."))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.synthetic import seed_users
+
+
+class Command(BaseCommand):
+    help = "Genera usuarios con categorías, métodos de pago, metas y movimientos sintéticos para pruebas de rendimiento."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1, help="Cantidad de usuarios a crear.")
+        parser.add_argument("--years", type=int, default=2, help="Años de historial por usuario.")
+        parser.add_argument("--per-month", type=int, default=60, help="Movimientos por mes y usuario.")
+        parser.add_argument("--prefix", default="demo", help="Prefijo de los nombres de usuario.")
+        parser.add_argument("--password", default="demo", help="Contraseña de los usuarios creados.")
+        parser.add_argument("--seed", type=int, help="Semilla para obtener datos reproducibles.")
+
+    def handle(self, *args, users, years, per_month, prefix, password, seed=None, **options):
+        if users < 1 or years < 1 or per_month < 1:
+            raise CommandError("--users, --years y --per-month deben ser mayores que cero.")
+        created = seed_users(users, years, per_month, prefix=prefix, password=password, seed=seed)
+        for username, count in created.items():
+            self.stdout.write(f"{username}: {count} movimientos.")
+        skipped = users - len(created)
+        if skipped:
+            self.stdout.write(f"{skipped} usuario(s) ya existían y se omitieron.")
+        self.stdout.write(self.style.SUCCESS(f"{len(created)} usuario(s) generados."))
@@ -0,0 +1,147 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from finance.routers import pinned_to_primary, replica_alias
+
+logger = logging.getLogger("finance.timing")
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS", "TRACE"}
+PRIMARY_PIN_COOKIE = "finance_primary"
+
+_current_metrics = contextvars.ContextVar("finance_request_metrics", default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_db_time = 0.0
+        self.template_depth = 0
+        self.statements = Counter()
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.db_time += elapsed
+                if self.template_depth:
+                    self.template_db_time += elapsed
+                self.query_count += 1
+                self.statements[sql] += 1
+
+    def duplicates(self, threshold: int) -> list[tuple[str, int]]:
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+@contextmanager
+def track_queries():
+    metrics = _current_metrics.get()
+    with ExitStack() as stack:
+        if metrics is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+        yield
+
+
+@contextmanager
+def track_template():
+    metrics = _current_metrics.get()
+    if metrics is None or metrics.template_depth:
+        yield
+        return
+    metrics.template_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.template_time += time.perf_counter() - start
+        metrics.template_depth -= 1
+
+
+def _server_timing(name: str, seconds: float, description: str = "") -> str:
+    entry = f"{name};dur={seconds * 1000:.1f}"
+    return f'{entry};desc="{description}"' if description else entry
+
+
+class RequestTimingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "FINANCE_REQUEST_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.duplicate_threshold = getattr(settings, "FINANCE_DUPLICATE_QUERY_THRESHOLD", 3)
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with track_queries():
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        total = time.perf_counter() - start
+        self.report(request, response, metrics, total)
+        return response
+
+    def report(self, request, response, metrics: RequestMetrics, total: float) -> None:
+        duplicates = metrics.duplicates(self.duplicate_threshold)
+        template_time = metrics.template_time - metrics.template_db_time
+        view_time = max(total - template_time - metrics.db_time, 0.0)
+        timings = [
+            _server_timing("total", total),
+            _server_timing("view", view_time, "sin consultas ni plantillas"),
+            _server_timing("db", metrics.db_time, f"{metrics.query_count} consultas"),
+            _server_timing("tpl", template_time, "sin consultas"),
+        ]
+        if duplicates:
+            timings.append(f'dup;desc="{sum(count for _, count in duplicates)} repetidas"')
+        response["Server-Timing"] = ", ".join(timings)
+        logger.info(
+            "method=%s path=%s status=%s total_ms=%.1f view_ms=%.1f db_ms=%.1f queries=%d template_ms=%.1f",
+            request.method,
+            request.path,
+            response.status_code,
+            total * 1000,
+            view_time * 1000,
+            metrics.db_time * 1000,
+            metrics.query_count,
+            template_time * 1000,
+        )
+        for sql, count in duplicates:
+            logger.warning("duplicate_query path=%s count=%d sql=%r", request.path, count, sql[:500])
+
+
+class PrimaryPinningMiddleware:
+    def __init__(self, get_response):
+        if replica_alias() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, "FINANCE_PRIMARY_PIN_SECONDS", 10)
+
+    def __call__(self, request):
+        writes = request.method not in SAFE_METHODS
+        with pinned_to_primary(writes or PRIMARY_PIN_COOKIE in request.COOKIES):
+            response = self.get_response(request)
+        if writes:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=self.pin_seconds,
+                httponly=True,
+                samesite="Lax",
+                secure=request.is_secure(),
+            )
+        return response
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+import django.db.models.deletion
+
+TRANSACTION_KINDS = {
+    "Income": "INCOME",
+    "FixedExpense": "FIXED",
+    "VariableExpense": "VARIABLE",
+    "Saving": "SAVING",
+}
+
+
+def populate_rollups(apps, schema_editor):
+    MonthlyRollup = apps.get_model("finance", "MonthlyRollup")
+    rollups = []
+    for model_name, kind in TRANSACTION_KINDS.items():
+        model = apps.get_model("finance", model_name)
+        rows = (
+            model.objects.order_by()
+            .annotate(year=ExtractYear("date"), month=ExtractMonth("date"))
+            .values("user_id", "year", "month", "category_id")
+            .annotate(total=Sum("amount"), count=Count("id"))
+        )
+        rollups.extend(MonthlyRollup(kind=kind, **row) for row in rows)
+    MonthlyRollup.objects.bulk_create(rollups, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0003_savinggoal_and_goal_relation"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("INCOME", "Ingreso"),
+                            ("FIXED", "Gasto Fijo"),
+                            ("VARIABLE", "Gasto Variable"),
+                            ("SAVING", "Ahorro"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("year", models.IntegerField()),
+                ("month", models.IntegerField()),
+                ("total", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "category",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="finance.category"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="monthlyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("user", "kind", "year", "month", "category"),
+                name="unique_monthly_rollup",
+            ),
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
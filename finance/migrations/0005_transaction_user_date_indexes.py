@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0004_monthlyrollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="fixedexpense",
+            index=models.Index(fields=["user", "date"], name="fixedexpense_user_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="fixedexpense",
+            index=models.Index(fields=["user", "category", "date"], name="fixedexpense_user_cat_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="income",
+            index=models.Index(fields=["user", "date"], name="income_user_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="income",
+            index=models.Index(fields=["user", "category", "date"], name="income_user_cat_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="saving",
+            index=models.Index(fields=["user", "date"], name="saving_user_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="saving",
+            index=models.Index(fields=["user", "category", "date"], name="saving_user_cat_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="saving",
+            index=models.Index(fields=["user", "goal"], name="saving_user_goal_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="variableexpense",
+            index=models.Index(fields=["user", "date"], name="variableexpense_user_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="variableexpense",
+            index=models.Index(fields=["user", "category", "date"], name="variableexpense_user_cat_idx"),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_total_saved(apps, schema_editor):
+    SavingGoal = apps.get_model("finance", "SavingGoal")
+    Saving = apps.get_model("finance", "Saving")
+    totals = (
+        Saving.objects.filter(goal=OuterRef("pk"))
+        .order_by()
+        .values("goal")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    SavingGoal.objects.update(
+        total_saved=Coalesce(Subquery(totals), Value(0), output_field=models.DecimalField(max_digits=14, decimal_places=2))
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0005_transaction_user_date_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="savinggoal",
+            name="total_saved",
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14),
+        ),
+        migrations.RunPython(populate_total_saved, migrations.RunPython.noop),
+    ]
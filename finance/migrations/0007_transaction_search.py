@@ -0,0 +1,47 @@
+from django.db import migrations
+
+SEARCH_TABLE = "finance_transaction_search"
+SEARCH_SOURCES = [
+    (0, "finance_income", "t.source", "''", ""),
+    (1, "finance_fixedexpense", "''", "''", ""),
+    (2, "finance_variableexpense", "''", "''", ""),
+    (
+        3,
+        "finance_saving",
+        "''",
+        "TRIM(t.goal_name || ' ' || COALESCE(g.name, ''))",
+        "LEFT JOIN finance_savinggoal g ON g.id = t.goal_id",
+    ),
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+        "owner, description, notes, source, goal, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    for slot, table, source, goal, join in SEARCH_SOURCES:
+        schema_editor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, owner, description, notes, source, goal) "
+            f"SELECT t.id * 4 + {slot}, 'u' || t.user_id || 'k{slot}', t.description, t.notes, {source}, "
+            f"{goal} FROM {table} t {join}"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0006_savinggoal_total_saved"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0007_transaction_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecurringFixedExpense",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("description", models.CharField(max_length=255)),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("due_day", models.IntegerField()),
+                ("notes", models.TextField(blank=True)),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "category",
+                    models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to="finance.category"),
+                ),
+                (
+                    "payment_method",
+                    models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to="finance.paymentmethod"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            options={
+                "ordering": ["due_day", "description"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="recurringfixedexpense",
+            index=models.Index(fields=["is_active", "id"], name="recurring_active_idx"),
+        ),
+        migrations.AddField(
+            model_name="fixedexpense",
+            name="recurring",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="expenses",
+                to="finance.recurringfixedexpense",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fixedexpense",
+            index=models.Index(fields=["recurring", "date"], name="fixedexpense_recurring_idx"),
+        ),
+    ]
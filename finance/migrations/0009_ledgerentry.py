@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+LEDGER_SOURCES = [
+    ("INCOME", "finance_income"),
+    ("FIXED", "finance_fixedexpense"),
+    ("VARIABLE", "finance_variableexpense"),
+    ("SAVING", "finance_saving"),
+]
+
+
+def populate_ledger(apps, schema_editor):
+    for kind, table in LEDGER_SOURCES:
+        schema_editor.execute(
+            "INSERT INTO finance_ledgerentry "
+            "(user_id, kind, source_id, date, amount, category_id, payment_method_id, description, notes) "
+            f"SELECT user_id, '{kind}', id, date, amount, category_id, payment_method_id, description, notes FROM {table}"
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0008_recurringfixedexpense"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LedgerEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("INCOME", "Ingreso"),
+                            ("FIXED", "Gasto Fijo"),
+                            ("VARIABLE", "Gasto Variable"),
+                            ("SAVING", "Ahorro"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("source_id", models.BigIntegerField()),
+                ("date", models.DateField()),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("description", models.CharField(max_length=255)),
+                ("notes", models.TextField(blank=True)),
+                (
+                    "category",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="finance.category"),
+                ),
+                (
+                    "payment_method",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="finance.paymentmethod"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            options={
+                "ordering": ["-date", "-id"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="ledgerentry",
+            constraint=models.UniqueConstraint(fields=("kind", "source_id"), name="unique_ledger_entry_source"),
+        ),
+        migrations.AddIndex(
+            model_name="ledgerentry",
+            index=models.Index(fields=["user", "date"], name="ledger_user_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="ledgerentry",
+            index=models.Index(fields=["user", "kind", "date"], name="ledger_user_kind_date_idx"),
+        ),
+        migrations.RunPython(populate_ledger, migrations.RunPython.noop),
+    ]
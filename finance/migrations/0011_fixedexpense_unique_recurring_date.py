@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("finance", "0010_categorybudget"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="fixedexpense",
+            name="fixedexpense_recurring_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="fixedexpense",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(recurring__isnull=False),
+                fields=["recurring", "date"],
+                name="unique_fixedexpense_recurring_date",
+            ),
+        ),
+    ]
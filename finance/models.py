@@ -1,5 +1,7 @@
+from decimal import Decimal
+
 from django.conf import settings
-from django.db import models
+from django.db import models, router, transaction
 
 
 class Category(models.Model):
@@ -57,9 +59,23 @@ class BaseTransaction(models.Model):
     class Meta:
         abstract = True
         ordering = ["-date", "-id"]
+        indexes = [
+            models.Index(fields=["user", "date"], name="%(class)s_user_date_idx"),
+            models.Index(fields=["user", "category", "date"], name="%(class)s_user_cat_idx"),
+        ]
+
+    def save(self, *args, using=None, **kwargs):
+        with transaction.atomic(using=using or router.db_for_write(type(self), instance=self)):
+            super().save(*args, using=using, **kwargs)
+
+    def delete(self, using=None, keep_parents=False):
+        with transaction.atomic(using=using or router.db_for_write(type(self), instance=self)):
+            return super().delete(using=using, keep_parents=keep_parents)
 
 
 class Income(BaseTransaction):
+    CATEGORY_KIND = Category.KIND_INCOME
+
     source = models.CharField(max_length=100)
 
     def __str__(self) -> str:
@@ -73,8 +89,28 @@ class Income(BaseTransaction):
 
 
 class FixedExpense(BaseTransaction):
+    CATEGORY_KIND = Category.KIND_FIXED
+
     is_paid = models.BooleanField(default=False)
     due_day = models.IntegerField(null=True, blank=True)
+    recurring = models.ForeignKey(
+        "RecurringFixedExpense",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=False,
+        related_name="expenses",
+    )
+
+    class Meta(BaseTransaction.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recurring", "date"],
+                condition=models.Q(recurring__isnull=False),
+                name="unique_fixedexpense_recurring_date",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.description} - {self.amount}"
@@ -86,7 +122,36 @@ class FixedExpense(BaseTransaction):
         return f"/gastos-fijos/{self.pk}/eliminar/"
 
 
+class RecurringFixedExpense(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    description = models.CharField(max_length=255)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    category = models.ForeignKey(Category, on_delete=models.PROTECT)
+    payment_method = models.ForeignKey(PaymentMethod, on_delete=models.PROTECT)
+    due_day = models.IntegerField()
+    notes = models.TextField(blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["due_day", "description"]
+        indexes = [
+            models.Index(fields=["is_active", "id"], name="recurring_active_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.description} - {self.amount}"
+
+    def get_update_url(self):
+        return f"/settings/recurring/{self.pk}/editar/"
+
+    def get_delete_url(self):
+        return f"/settings/recurring/{self.pk}/eliminar/"
+
+
 class VariableExpense(BaseTransaction):
+    CATEGORY_KIND = Category.KIND_VARIABLE
+
     TYPE_NECESSARY = "NECESARIO"
     TYPE_WANT = "GUSTO"
 
@@ -108,6 +173,8 @@ class VariableExpense(BaseTransaction):
 
 
 class Saving(BaseTransaction):
+    CATEGORY_KIND = Category.KIND_SAVING
+
     SAVING_TYPE_AHORRO = "AHORRO"
     SAVING_TYPE_INVERSION = "INVERSION"
     SAVING_TYPE_FONDO = "FONDO"
@@ -123,6 +190,12 @@ class Saving(BaseTransaction):
     goal_name = models.CharField(max_length=150, blank=True)
     goal_amount = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
 
+    class Meta(BaseTransaction.Meta):
+        indexes = [
+            *BaseTransaction.Meta.indexes,
+            models.Index(fields=["user", "goal"], name="saving_user_goal_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.description} - {self.amount}"
 
@@ -137,6 +210,7 @@ class SavingGoal(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     name = models.CharField(max_length=150)
     target_amount = models.DecimalField(max_digits=12, decimal_places=2)
+    total_saved = models.DecimalField(max_digits=14, decimal_places=2, default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
 
@@ -149,8 +223,85 @@ class SavingGoal(models.Model):
     def __str__(self) -> str:
         return self.name
 
+    def get_progress_pct(self) -> Decimal:
+        if not self.target_amount:
+            return Decimal("0")
+        return min(self.total_saved / self.target_amount * Decimal("100"), Decimal("100"))
+
     def get_update_url(self):
         return f"/ahorros/metas/{self.pk}/editar/"
 
     def get_delete_url(self):
         return f"/ahorros/metas/{self.pk}/eliminar/"
+
+
+class CategoryBudget(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="budgets")
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["category__kind", "category__name"]
+        constraints = [
+            models.UniqueConstraint(fields=["category"], name="unique_budget_per_category"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "is_active"], name="budget_user_active_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.category} - {self.amount}"
+
+    def get_update_url(self):
+        return f"/settings/budgets/{self.pk}/editar/"
+
+    def get_delete_url(self):
+        return f"/settings/budgets/{self.pk}/eliminar/"
+
+
+class MonthlyRollup(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=Category.KIND_CHOICES)
+    year = models.IntegerField()
+    month = models.IntegerField()
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "kind", "year", "month", "category"],
+                name="unique_monthly_rollup",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.year}-{self.month:02d} - {self.total}"
+
+
+class LedgerEntry(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=Category.KIND_CHOICES)
+    source_id = models.BigIntegerField()
+    date = models.DateField()
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    payment_method = models.ForeignKey(PaymentMethod, on_delete=models.CASCADE)
+    description = models.CharField(max_length=255)
+    notes = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-date", "-id"]
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "source_id"], name="unique_ledger_entry_source"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "date"], name="ledger_user_date_idx"),
+            models.Index(fields=["user", "kind", "date"], name="ledger_user_kind_date_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.date} - {self.amount}"
@@ -0,0 +1,104 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.db.models import Q
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+DATE_ORDER = (("date", True), ("id", True))
+RANK_ORDER = (("search_rank", False), ("date", True), ("id", True))
+
+
+def encode_cursor(direction: str, date: datetime.date, pk: int, rank: float | None = None) -> str:
+    values = [direction, date.isoformat(), pk]
+    if rank is not None:
+        values.append(rank)
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(value: str | None) -> tuple[str, datetime.date, int, float | None] | None:
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        direction, date, pk, *rank = json.loads(raw)
+        if direction not in (NEXT, PREVIOUS) or len(rank) > 1:
+            return None
+        return direction, datetime.date.fromisoformat(date), int(pk), float(rank[0]) if rank else None
+    except (binascii.Error, ValueError, TypeError):
+        return None
+
+
+class KeysetPage:
+    def __init__(self, object_list, has_next, has_previous, total_count=None, ranked=False):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.total_count = total_count
+        self.ranked = ranked
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+    @property
+    def next_cursor(self) -> str | None:
+        if not self.has_next or not self.object_list:
+            return None
+        return self._cursor(NEXT, self.object_list[-1])
+
+    @property
+    def previous_cursor(self) -> str | None:
+        if not self.has_previous or not self.object_list:
+            return None
+        return self._cursor(PREVIOUS, self.object_list[0])
+
+    def _cursor(self, direction: str, row) -> str:
+        return encode_cursor(direction, row.date, row.pk, row.search_rank if self.ranked else None)
+
+
+def _ordering(keys, forward: bool) -> list[str]:
+    return [f"-{field}" if descending == forward else field for field, descending in keys]
+
+
+def _seek(keys, values, forward: bool) -> Q:
+    condition = Q()
+    equal = Q()
+    for (field, descending), value in zip(keys, values):
+        condition |= equal & Q(**{f"{field}__{'lt' if descending == forward else 'gt'}": value})
+        equal &= Q(**{field: value})
+    field, descending = keys[0]
+    return condition & Q(**{f"{field}__{'lte' if descending == forward else 'gte'}": values[0]})
+
+
+def paginate_keyset(
+    queryset, cursor: str | None, page_size: int, with_count: bool = False, ranked: bool = False
+) -> KeysetPage:
+    keys = RANK_ORDER if ranked else DATE_ORDER
+    total_count = queryset.count() if with_count else None
+    position = decode_cursor(cursor)
+    if position is not None and (position[3] is not None) != ranked:
+        position = None
+    if position is None:
+        rows = list(queryset.order_by(*_ordering(keys, True))[: page_size + 1])
+        return KeysetPage(rows[:page_size], len(rows) > page_size, False, total_count, ranked)
+
+    direction, date, pk, rank = position
+    values = [rank, date, pk] if ranked else [date, pk]
+    forward = direction == NEXT
+    rows = list(queryset.filter(_seek(keys, values, forward)).order_by(*_ordering(keys, forward))[: page_size + 1])
+    if forward:
+        return KeysetPage(rows[:page_size], len(rows) > page_size, True, total_count, ranked)
+    page_rows = rows[:page_size]
+    page_rows.reverse()
+    return KeysetPage(page_rows, True, len(rows) > page_size, total_count, ranked)
@@ -0,0 +1,119 @@
+import datetime
+import re
+from collections.abc import Callable
+
+from django.db import connection, transaction
+
+from finance import services
+from finance.models import FixedExpense, Income, Saving, VariableExpense
+from finance.rollups import TRANSACTION_MODELS
+
+SQLITE_FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)(?!\()(?P<table>\w+)")
+POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on (?P<table>\w+)")
+LIST_SELECT_RELATED = {
+    Income: ("category", "payment_method"),
+    FixedExpense: ("category",),
+    VariableExpense: ("category", "payment_method"),
+    Saving: ("category", "goal"),
+}
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+        self.label = ""
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith("SELECT"):
+            self.queries.append((self.label, sql, params))
+        return execute(sql, params, many, context)
+
+
+def service_calls(user, year: int, month: int) -> list[tuple[str, Callable[[], object]]]:
+    calls = [
+        ("get_month_kpis", lambda: services.get_month_kpis(user, year, month)),
+        ("get_total", lambda: services.get_total(user, Income, year, month)),
+        ("get_saving_totals", lambda: services.get_saving_totals(user, year, month)),
+        ("get_expense_category_breakdown", lambda: services.get_expense_category_breakdown(user, year, month)),
+        ("get_top_expenses", lambda: services.get_top_expenses(user, year, month)),
+        (
+            "get_year_12_months_series_for_models",
+            lambda: services.get_year_12_months_series_for_models(TRANSACTION_MODELS, user, year),
+        ),
+        (
+            "get_last_12_months_series_for_models",
+            lambda: services.get_last_12_months_series_for_models(user, TRANSACTION_MODELS),
+        ),
+        (
+            "get_time_series[ledger]",
+            lambda: services.get_time_series(
+                user,
+                TRANSACTION_MODELS,
+                datetime.date(year, month, 1),
+                datetime.date(year, month, 28),
+                "week",
+                "payment_method",
+            ),
+        ),
+        ("get_saving_goal_progress", lambda: services.get_saving_goal_progress(user)),
+        ("get_budget_status", lambda: services.get_budget_status(user, year, month)),
+        ("get_saving_distribution", lambda: services.get_saving_distribution(user, year)),
+    ]
+    for model in TRANSACTION_MODELS:
+        name = model._meta.model_name
+        calls.extend(
+            [
+                (f"get_category_breakdown[{name}]", lambda model=model: services.get_category_breakdown(user, model, year, month)),
+                (f"get_daily_series[{name}]", lambda model=model: services.get_daily_series(user, model, year, month)),
+                (
+                    f"list[{name}]",
+                    lambda model=model: list(
+                        model.objects.filter(user=user).select_related(*LIST_SELECT_RELATED[model])[:10]
+                    ),
+                ),
+            ]
+        )
+    return calls
+
+
+def record_service_queries(user, year: int, month: int) -> list[tuple[str, str, tuple]]:
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        for label, call in service_calls(user, year, month):
+            recorder.label = label
+            call()
+    return recorder.queries
+
+
+def explain(sql: str, params) -> list[str]:
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in cursor.fetchall()]
+        if connection.vendor == "postgresql":
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}", params)
+            return [row[0] for row in cursor.fetchall()]
+    raise ValueError(f"La revisión de planes de consulta no está disponible para {connection.vendor}.")
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    pattern = SQLITE_FULL_SCAN if connection.vendor == "sqlite" else POSTGRES_FULL_SCAN
+    return [line for line in plan if pattern.search(line.strip())]
+
+
+def find_full_scans(user, year: int, month: int) -> list[dict]:
+    problems = []
+    for label, sql, params in record_service_queries(user, year, month):
+        plan = explain(sql, params)
+        scans = full_scans(plan)
+        if scans:
+            problems.append({"label": label, "sql": sql, "plan": plan, "scans": scans})
+    return problems
+
+
+def assert_no_full_scans(user, year: int, month: int) -> None:
+    problems = find_full_scans(user, year, month)
+    if problems:
+        details = "\n".join(f"{problem['label']}: {'; '.join(problem['scans'])}" for problem in problems)
+        raise AssertionError(f"Consultas con recorrido completo de tabla:\n{details}")
@@ -0,0 +1,82 @@
+import json
+import multiprocessing
+import os
+import time
+from functools import partial
+
+import django
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+
+from finance.caching import bump_data_version_on_commit
+from finance.database import sqlite_pragmas
+from finance.ledger import diff_user_ledger, rebuild_user_ledger
+from finance.rollups import diff_goal_totals, diff_user_rollups, rebuild_goal_totals, rebuild_user_rollups
+
+
+def supports_parallel_writes() -> bool:
+    connection = connections[DEFAULT_DB_ALIAS]
+    if connection.vendor != "sqlite":
+        return True
+    options = connection.settings_dict.get("OPTIONS", {})
+    return "busy_timeout" in sqlite_pragmas() and options.get("transaction_mode") == "IMMEDIATE"
+
+
+def default_workers() -> int:
+    return (os.cpu_count() or 1) if supports_parallel_writes() else 1
+
+
+def init_worker() -> None:
+    if not apps.ready:
+        django.setup()
+
+
+def recompute_user(user_id, verify: bool = False) -> dict:
+    start = time.perf_counter()
+    result = {"user_id": user_id}
+    try:
+        with transaction.atomic():
+            result["rollups"] = rebuild_user_rollups(user_id)
+            result["goals"] = rebuild_goal_totals(user_id)
+            result["entries"] = rebuild_user_ledger(user_id)
+            bump_data_version_on_commit(user_id)
+        if verify:
+            result["mismatches"] = (
+                len(diff_user_rollups(user_id)) + len(diff_goal_totals(user_id)) + len(diff_user_ledger(user_id))
+            )
+    except DatabaseError as exc:
+        result["error"] = str(exc)
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def recompute_users(user_ids: list, workers: int = 1, verify: bool = False):
+    workers = min(workers, len(user_ids))
+    if workers <= 1:
+        for user_id in user_ids:
+            yield recompute_user(user_id, verify)
+        return
+    connections.close_all()
+    failed = []
+    with multiprocessing.Pool(workers, initializer=init_worker) as pool:
+        for result in pool.imap_unordered(partial(recompute_user, verify=verify), user_ids):
+            if "error" in result:
+                failed.append(result["user_id"])
+                continue
+            yield result
+    for user_id in failed:
+        yield recompute_user(user_id, verify)
+
+
+def load_state(path: str) -> set:
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as handle:
+        return set(json.load(handle).get("completed", []))
+
+
+def save_state(path: str, completed: set) -> None:
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as handle:
+        json.dump({"completed": sorted(completed)}, handle)
+    os.replace(temporary, path)
@@ -0,0 +1,79 @@
+import calendar
+import datetime
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+
+from finance.bulk import bulk_create_transactions
+from finance.models import FixedExpense, RecurringFixedExpense
+
+TEMPLATE_FIELDS = ("pk", "user_id", "description", "amount", "category_id", "payment_method_id", "due_day", "notes")
+
+
+def next_month(today: datetime.date) -> tuple[int, int]:
+    if today.month == 12:
+        return today.year + 1, 1
+    return today.year, today.month + 1
+
+
+def month_bounds(year: int, month: int) -> tuple[datetime.date, datetime.date]:
+    return datetime.date(year, month, 1), datetime.date(year, month, calendar.monthrange(year, month)[1])
+
+
+def pending_templates(year: int, month: int, user_ids=None):
+    first_day, last_day = month_bounds(year, month)
+    materialized = FixedExpense.objects.filter(recurring=OuterRef("pk"), date__range=(first_day, last_day))
+    templates = RecurringFixedExpense.objects.filter(
+        is_active=True,
+        category__is_active=True,
+        payment_method__is_active=True,
+    ).exclude(Exists(materialized))
+    if user_ids:
+        templates = templates.filter(user_id__in=user_ids)
+    return templates.order_by("pk")
+
+
+def materialize_month(year: int, month: int, user_ids=None, batch_size=None, dry_run: bool = False) -> int:
+    batch_size = batch_size or getattr(settings, "FINANCE_IMPORT_BATCH_SIZE", 1000)
+    templates = pending_templates(year, month, user_ids)
+    if dry_run:
+        return templates.count()
+    last_day = month_bounds(year, month)[1].day
+    created = 0
+    last_pk = 0
+    conflicted = False
+    while True:
+        try:
+            with transaction.atomic():
+                rows = _materialize_batch(templates, last_pk, batch_size, year, month, last_day)
+        except IntegrityError:
+            if conflicted:
+                raise
+            conflicted = True
+            continue
+        if not rows:
+            return created
+        conflicted = False
+        created += len(rows)
+        last_pk = rows[-1][0]
+
+
+def _materialize_batch(templates, last_pk, batch_size: int, year: int, month: int, last_day: int) -> list:
+    rows = list(templates.filter(pk__gt=last_pk).values_list(*TEMPLATE_FIELDS)[:batch_size])
+    batch = [
+        FixedExpense(
+            recurring_id=pk,
+            user_id=user_id,
+            date=datetime.date(year, month, min(due_day, last_day)),
+            amount=amount,
+            description=description,
+            category_id=category_id,
+            payment_method_id=payment_method_id,
+            due_day=due_day,
+            notes=notes,
+        )
+        for pk, user_id, description, amount, category_id, payment_method_id, due_day, notes in rows
+    ]
+    bulk_create_transactions(FixedExpense, batch)
+    return rows
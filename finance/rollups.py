@@ -0,0 +1,207 @@
+import datetime
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+
+from finance.models import FixedExpense, Income, MonthlyRollup, Saving, SavingGoal, VariableExpense
+
+TRANSACTION_MODELS = [Income, FixedExpense, VariableExpense, Saving]
+CENT = Decimal("0.01")
+LOOKUP_CHUNK_SIZE = 500
+
+
+def _as_date(value) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    return value
+
+
+def rollup_key(user_id, kind: str, date, category_id) -> tuple:
+    date = _as_date(date)
+    return user_id, kind, date.year, date.month, category_id
+
+
+def apply_deltas(deltas: dict) -> None:
+    for (user_id, kind, year, month, category_id), (amount, count) in deltas.items():
+        if not amount and not count:
+            continue
+        lookup = {"user_id": user_id, "kind": kind, "year": year, "month": month, "category_id": category_id}
+        updated = MonthlyRollup.objects.filter(**lookup).update(total=F("total") + amount, count=F("count") + count)
+        if updated or count < 0:
+            continue
+        try:
+            with transaction.atomic():
+                MonthlyRollup.objects.create(total=amount, count=count, **lookup)
+        except IntegrityError:
+            MonthlyRollup.objects.filter(**lookup).update(total=F("total") + amount, count=F("count") + count)
+
+
+def chunks(values: list, size: int = LOOKUP_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def apply_bulk_deltas(deltas: dict) -> None:
+    pending = {key: value for key, value in deltas.items() if value[0] or value[1]}
+    periods = {}
+    for user_id, kind, year, month, _ in pending:
+        periods.setdefault((kind, year, month), set()).add(user_id)
+    existing = {}
+    for (kind, year, month), user_ids in periods.items():
+        for chunk in chunks(sorted(user_ids)):
+            rows = MonthlyRollup.objects.filter(kind=kind, year=year, month=month, user_id__in=chunk).values_list(
+                "pk", "user_id", "category_id"
+            )
+            existing.update({(user_id, kind, year, month, category_id): pk for pk, user_id, category_id in rows})
+    updates, missing = {}, {}
+    for key, value in pending.items():
+        if key in existing:
+            updates.setdefault(value, []).append(existing[key])
+        elif value[1] >= 0:
+            missing[key] = value
+    for (amount, count), pks in updates.items():
+        for chunk in chunks(pks):
+            MonthlyRollup.objects.filter(pk__in=chunk).update(total=F("total") + amount, count=F("count") + count)
+    if not missing:
+        return
+    try:
+        with transaction.atomic():
+            MonthlyRollup.objects.bulk_create(
+                [
+                    MonthlyRollup(
+                        user_id=user_id,
+                        kind=kind,
+                        year=year,
+                        month=month,
+                        category_id=category_id,
+                        total=amount,
+                        count=count,
+                    )
+                    for (user_id, kind, year, month, category_id), (amount, count) in missing.items()
+                ],
+                batch_size=LOOKUP_CHUNK_SIZE,
+            )
+    except IntegrityError:
+        apply_deltas(missing)
+
+
+def add_delta(deltas: dict, key: tuple, amount, sign: int = 1) -> None:
+    current_amount, current_count = deltas.get(key, (Decimal("0"), 0))
+    deltas[key] = (current_amount + sign * Decimal(str(amount)), current_count + sign)
+
+
+def apply_rows(rows, sign: int = 1) -> None:
+    deltas = {}
+    for user_id, kind, date, category_id, amount in rows:
+        add_delta(deltas, rollup_key(user_id, kind, date, category_id), amount, sign)
+    with transaction.atomic():
+        apply_deltas(deltas)
+
+
+def compute_user_rollups(user_id) -> dict:
+    totals = {}
+    for model in TRANSACTION_MODELS:
+        rows = (
+            model.objects.filter(user_id=user_id)
+            .order_by()
+            .annotate(year=ExtractYear("date"), month=ExtractMonth("date"))
+            .values("year", "month", "category_id")
+            .annotate(total=Sum("amount"), count=Count("id"))
+        )
+        for row in rows:
+            key = (user_id, model.CATEGORY_KIND, row["year"], row["month"], row["category_id"])
+            totals[key] = (row["total"].quantize(CENT), row["count"])
+    return totals
+
+
+def stored_user_rollups(user_id) -> dict:
+    rows = MonthlyRollup.objects.filter(user_id=user_id, count__gt=0).values_list(
+        "kind",
+        "year",
+        "month",
+        "category_id",
+        "total",
+        "count",
+    )
+    return {(user_id, kind, year, month, category_id): (total, count) for kind, year, month, category_id, total, count in rows}
+
+
+def diff_user_rollups(user_id) -> dict:
+    expected = compute_user_rollups(user_id)
+    stored = stored_user_rollups(user_id)
+    mismatches = {}
+    for key in expected.keys() | stored.keys():
+        expected_value = expected.get(key, (Decimal("0"), 0))
+        stored_value = stored.get(key, (Decimal("0"), 0))
+        if expected_value != stored_value:
+            mismatches[key] = {"expected": expected_value, "stored": stored_value}
+    return mismatches
+
+
+@transaction.atomic
+def rebuild_user_rollups(user_id) -> int:
+    totals = compute_user_rollups(user_id)
+    MonthlyRollup.objects.filter(user_id=user_id).delete()
+    MonthlyRollup.objects.bulk_create(
+        [
+            MonthlyRollup(
+                user_id=user_id,
+                kind=kind,
+                year=year,
+                month=month,
+                category_id=category_id,
+                total=total,
+                count=count,
+            )
+            for (_, kind, year, month, category_id), (total, count) in totals.items()
+        ],
+        batch_size=1000,
+    )
+    return len(totals)
+
+
+def apply_goal_deltas(deltas: dict) -> None:
+    for goal_id, amount in deltas.items():
+        if goal_id is not None and amount:
+            SavingGoal.objects.filter(pk=goal_id).update(total_saved=F("total_saved") + amount)
+
+
+def add_goal_delta(deltas: dict, goal_id, amount, sign: int = 1) -> None:
+    if goal_id is not None:
+        deltas[goal_id] = deltas.get(goal_id, Decimal("0")) + sign * Decimal(str(amount))
+
+
+def with_computed_saved_totals(goals):
+    return goals.annotate(
+        computed_total=Coalesce(
+            Sum("savings__amount"),
+            Value(Decimal("0")),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        )
+    )
+
+
+def diff_goal_totals(user_id) -> dict:
+    goals = with_computed_saved_totals(SavingGoal.objects.filter(user_id=user_id).order_by())
+    return {
+        goal_id: {"expected": computed_total.quantize(CENT), "stored": total_saved}
+        for goal_id, computed_total, total_saved in goals.values_list("pk", "computed_total", "total_saved")
+        if computed_total.quantize(CENT) != total_saved
+    }
+
+
+def rebuild_goal_totals(user_id) -> int:
+    totals = (
+        Saving.objects.filter(goal=OuterRef("pk"))
+        .order_by()
+        .values("goal")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    return SavingGoal.objects.filter(user_id=user_id).update(
+        total_saved=Coalesce(Subquery(totals), Value(Decimal("0")), output_field=DecimalField(max_digits=14, decimal_places=2))
+    )
@@ -0,0 +1,80 @@
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_replica_reads = contextvars.ContextVar("finance_replica_reads", default=False)
+_pinned_to_primary = contextvars.ContextVar("finance_pinned_to_primary", default=False)
+
+
+def replica_alias() -> str | None:
+    alias = getattr(settings, "FINANCE_READ_DATABASE", None)
+    if alias and alias != DEFAULT_DB_ALIAS and alias in settings.DATABASES:
+        return alias
+    return None
+
+
+def read_alias(replica: bool | None = None) -> str | None:
+    if replica is None:
+        replica = _replica_reads.get()
+    if replica and not _pinned_to_primary.get():
+        return replica_alias()
+    return None
+
+
+@contextmanager
+def replica_reads():
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def pinned_to_primary(pinned: bool = True):
+    token = _pinned_to_primary.set(pinned)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+def read_from_replica(view_func):
+    if iscoroutinefunction(view_func):
+
+        async def _view_wrapper(request, *args, **kwargs):
+            with replica_reads():
+                return await view_func(request, *args, **kwargs)
+
+    else:
+
+        def _view_wrapper(request, *args, **kwargs):
+            with replica_reads():
+                response = view_func(request, *args, **kwargs)
+                if callable(getattr(response, "render", None)):
+                    response.render()
+                return response
+
+    return wraps(view_func)(_view_wrapper)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == "finance":
+            return read_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == "finance":
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,143 @@
+import re
+
+from django.db import connection, transaction
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from finance.models import FixedExpense, Income, Saving, VariableExpense
+from finance.rollups import chunks
+
+SEARCH_TABLE = "finance_transaction_search"
+SEARCH_SLOTS = {
+    Income: 0,
+    FixedExpense: 1,
+    VariableExpense: 2,
+    Saving: 3,
+}
+SEARCH_COLUMNS = "{description notes source goal}"
+FALLBACK_FIELDS = {
+    Income: ["description", "notes", "source"],
+    FixedExpense: ["description", "notes"],
+    VariableExpense: ["description", "notes"],
+    Saving: ["description", "notes", "goal_name", "goal__name"],
+}
+TERM_PATTERN = re.compile(r"\w+")
+
+
+def search_enabled() -> bool:
+    return connection.vendor == "sqlite"
+
+
+def search_terms(query: str | None) -> list[str]:
+    return TERM_PATTERN.findall(query or "")
+
+
+def _rowid(model, pk: int) -> int:
+    return pk * len(SEARCH_SLOTS) + SEARCH_SLOTS[model]
+
+
+def _owner(model, user_id: int) -> str:
+    return f"u{user_id}k{SEARCH_SLOTS[model]}"
+
+
+def match_expression(model, user_id: int, terms: list[str]) -> str:
+    phrases = " AND ".join(f'"{term}"*' for term in terms)
+    return f'owner : "{_owner(model, user_id)}" AND {SEARCH_COLUMNS} : ({phrases})'
+
+
+def _document_rows(model, pks) -> list[tuple]:
+    fields = ["pk", "user_id", "description", "notes"]
+    if model is Income:
+        fields.append("source")
+    if model is Saving:
+        fields.extend(["goal_name", "goal__name"])
+    rows = []
+    for values in model.objects.filter(pk__in=pks).values_list(*fields):
+        pk, user_id, description, notes, *extra = values
+        source = extra[0] if model is Income else ""
+        goal = " ".join(filter(None, extra)) if model is Saving else ""
+        rows.append((_rowid(model, pk), _owner(model, user_id), description, notes, source, goal))
+    return rows
+
+
+def _insert_rows(rows: list[tuple]) -> None:
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, owner, description, notes, source, goal) "
+            "VALUES (%s, %s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def unindex_transactions(model, pks) -> None:
+    if not search_enabled() or not pks:
+        return
+    rowids = [_rowid(model, pk) for pk in pks]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(rowids))})",
+            rowids,
+        )
+
+
+def index_transactions(model, pks) -> None:
+    if not search_enabled() or not pks:
+        return
+    pks = list(pks)
+    with transaction.atomic():
+        unindex_transactions(model, pks)
+        rows = _document_rows(model, pks)
+        if rows:
+            _insert_rows(rows)
+
+
+def index_new_transactions(model, instances) -> None:
+    if not search_enabled() or not instances:
+        return
+    for chunk in chunks([instance.pk for instance in instances]):
+        _insert_rows(_document_rows(model, chunk))
+
+
+def filter_search(queryset, user, query: str | None):
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    model = queryset.model
+    if not search_enabled():
+        condition = Q()
+        for term in terms:
+            term_condition = Q()
+            for field in FALLBACK_FIELDS[model]:
+                term_condition |= Q(**{f"{field}__icontains": term})
+            condition &= term_condition
+        return queryset.filter(condition)
+    matches = RawSQL(
+        f"SELECT (rowid - %s) / %s FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s",
+        (SEARCH_SLOTS[model], len(SEARCH_SLOTS), match_expression(model, user.pk, terms)),
+    )
+    return queryset.filter(pk__in=matches)
+
+
+def search_ranked(query: str | None) -> bool:
+    return search_enabled() and bool(search_terms(query))
+
+
+def rank_search(queryset, user, query: str):
+    model = queryset.model
+    column = f"{connection.ops.quote_name(model._meta.db_table)}.{connection.ops.quote_name(model._meta.pk.column)}"
+    rank = RawSQL(
+        f"SELECT bm25({SEARCH_TABLE}) FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s AND rowid = {column} * %s + %s",
+        (match_expression(model, user.pk, search_terms(query)), len(SEARCH_SLOTS), SEARCH_SLOTS[model]),
+        output_field=FloatField(),
+    )
+    return queryset.annotate(search_rank=rank)
+
+
+def filter_ledger_search(queryset, user, query: str | None):
+    if not search_terms(query):
+        return queryset
+    condition = Q()
+    for model in SEARCH_SLOTS:
+        matches = filter_search(model.objects.filter(user=user), user, query).values("pk")
+        condition |= Q(kind=model.CATEGORY_KIND, source_id__in=matches)
+    return queryset.filter(condition)
@@ -2,10 +2,23 @@ import calendar
 import datetime
 from decimal import Decimal
 
-from django.db.models import Sum
+from django.db.models import DecimalField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Trunc
 from django.utils import timezone
 
-from finance.models import FixedExpense, Income, Saving, SavingGoal, VariableExpense
+from finance.models import (
+    Category,
+    CategoryBudget,
+    FixedExpense,
+    Income,
+    LedgerEntry,
+    MonthlyRollup,
+    Saving,
+    SavingGoal,
+    VariableExpense,
+)
+from finance.recurring import pending_templates
+from finance.rollups import CENT
 
 
 def _month_range(year: int, month: int) -> tuple[datetime.date, datetime.date]:
@@ -21,34 +34,86 @@ def _coerce_date(value: datetime.date | datetime.datetime) -> datetime.date:
     return value
 
 
-def get_month_kpis(user, year: int, month: int) -> dict:
-    start, end = _month_range(year, month)
+def _previous_month(year: int, month: int) -> tuple[int, int]:
+    if month == 1:
+        return year - 1, 12
+    return year, month - 1
+
+
+def _period_filter(start: datetime.date, end: datetime.date) -> Q:
+    if start.year == end.year:
+        return Q(year=start.year, month__gte=start.month, month__lte=end.month)
+    return (
+        Q(year=start.year, month__gte=start.month)
+        | Q(year__gt=start.year, year__lt=end.year)
+        | Q(year=end.year, month__lte=end.month)
+    )
+
+
+GRANULARITIES = ("day", "week", "month", "quarter", "year")
+ROLLUP_GRANULARITIES = ("month", "quarter", "year")
+GROUP_BY_FIELDS = {
+    "category": "category__name",
+    "payment_method": "payment_method__name",
+    "expense_type": "expense_type",
+    "saving_type": "saving_type",
+}
+LEDGER_GROUP_BY = (None, "category", "payment_method")
+EXPENSE_KINDS = [FixedExpense.CATEGORY_KIND, VariableExpense.CATEGORY_KIND]
+
+
+def _rollups(user, models):
+    return MonthlyRollup.objects.filter(user=user, kind__in=[model.CATEGORY_KIND for model in models], count__gt=0)
+
+
+def get_total(user, model, year: int, month: int | None = None) -> Decimal:
+    rollups = _rollups(user, [model]).filter(year=year)
+    if month is not None:
+        rollups = rollups.filter(month=month)
+    return rollups.aggregate(total=Sum("total"))["total"] or Decimal("0")
+
 
-    def total_for_range(model, range_start, range_end):
-        return (
-            model.objects.filter(user=user, date__range=(range_start, range_end)).aggregate(total=Sum("amount"))["total"]
-            or Decimal("0")
+def get_saving_totals(user, year: int, month: int) -> dict:
+    saving = Q(kind=Saving.CATEGORY_KIND)
+    totals = (
+        _rollups(user, [Income, Saving])
+        .filter(year=year)
+        .aggregate(
+            total_month=Sum("total", filter=saving & Q(month=month)),
+            total_year=Sum("total", filter=saving),
+            income_month=Sum("total", filter=Q(kind=Income.CATEGORY_KIND, month=month)),
         )
+    )
+    total_month = totals["total_month"] or Decimal("0")
+    income_month = totals["income_month"] or Decimal("0")
+    return {
+        "total_month": total_month,
+        "total_year": totals["total_year"] or Decimal("0"),
+        "saving_pct": (total_month / income_month * Decimal("100")) if income_month else Decimal("0"),
+    }
 
-    income_total = total_for_range(Income, start, end)
-    fixed_total = total_for_range(FixedExpense, start, end)
-    variable_total = total_for_range(VariableExpense, start, end)
-    saving_total = total_for_range(Saving, start, end)
-    expense_total = fixed_total + variable_total
-    balance = income_total - expense_total - saving_total
 
-    prev_month = month - 1
-    prev_year = year
-    if prev_month == 0:
-        prev_month = 12
-        prev_year -= 1
-    prev_start, prev_end = _month_range(prev_year, prev_month)
-    prev_income = total_for_range(Income, prev_start, prev_end)
-    prev_expenses = total_for_range(FixedExpense, prev_start, prev_end) + total_for_range(
-        VariableExpense,
-        prev_start,
-        prev_end,
+def get_month_kpis(user, year: int, month: int) -> dict:
+    prev_year, prev_month = _previous_month(year, month)
+    rows = (
+        _rollups(user, [Income, FixedExpense, VariableExpense, Saving])
+        .filter(Q(year=year, month=month) | Q(year=prev_year, month=prev_month))
+        .values("kind", "year", "month")
+        .annotate(total=Sum("total"))
     )
+    totals = {(row["kind"], row["year"], row["month"]): row["total"] for row in rows}
+
+    def total_for(model, total_year, total_month):
+        return totals.get((model.CATEGORY_KIND, total_year, total_month)) or Decimal("0")
+
+    income_total = total_for(Income, year, month)
+    fixed_total = total_for(FixedExpense, year, month)
+    variable_total = total_for(VariableExpense, year, month)
+    saving_total = total_for(Saving, year, month)
+    prev_income = total_for(Income, prev_year, prev_month)
+    prev_expenses = total_for(FixedExpense, prev_year, prev_month) + total_for(VariableExpense, prev_year, prev_month)
+    expense_total = fixed_total + variable_total
+    balance = income_total - expense_total - saving_total
 
     delta_income = income_total - prev_income
     delta_expenses = expense_total - prev_expenses
@@ -70,56 +135,186 @@ def get_month_kpis(user, year: int, month: int) -> dict:
     }
 
 
-def get_last_12_months_series(user, model):
-    today = timezone.localdate()
-    start_month = (today.replace(day=1) - datetime.timedelta(days=365)).replace(day=1)
-    months = []
-    current = start_month
-    for _ in range(12):
-        months.append(current)
-        year = current.year + (current.month // 12)
-        month = current.month % 12 + 1
-        current = current.replace(year=year, month=month)
-
-    totals_map = {}
-    for month_start in months:
-        month_end = datetime.date(
-            month_start.year,
-            month_start.month,
-            calendar.monthrange(month_start.year, month_start.month)[1],
+def _add_months(month_start: datetime.date, count: int) -> datetime.date:
+    index = month_start.year * 12 + month_start.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def _bucket_start(value: datetime.date, granularity: str) -> datetime.date:
+    value = _coerce_date(value)
+    if granularity == "day":
+        return value
+    if granularity == "week":
+        return value - datetime.timedelta(days=value.weekday())
+    if granularity == "month":
+        return value.replace(day=1)
+    if granularity == "quarter":
+        return datetime.date(value.year, (value.month - 1) // 3 * 3 + 1, 1)
+    return datetime.date(value.year, 1, 1)
+
+
+def _next_bucket(bucket: datetime.date, granularity: str) -> datetime.date:
+    if granularity == "day":
+        return bucket + datetime.timedelta(days=1)
+    if granularity == "week":
+        return bucket + datetime.timedelta(days=7)
+    return _add_months(bucket, {"month": 1, "quarter": 3, "year": 12}[granularity])
+
+
+def _bucket_label(bucket: datetime.date, granularity: str) -> str:
+    if granularity == "month":
+        return f"{bucket.year}-{bucket.month:02d}"
+    if granularity == "quarter":
+        return f"{bucket.year}-T{(bucket.month - 1) // 3 + 1}"
+    if granularity == "year":
+        return str(bucket.year)
+    return bucket.isoformat()
+
+
+def _buckets(start: datetime.date, end: datetime.date, granularity: str) -> list[datetime.date]:
+    buckets = []
+    bucket = _bucket_start(start, granularity)
+    while bucket <= end:
+        buckets.append(bucket)
+        bucket = _next_bucket(bucket, granularity)
+    return buckets
+
+
+def _rollup_bucket_rows(user, models, buckets, end, granularity, group_by):
+    group_field = GROUP_BY_FIELDS[group_by] if group_by else None
+    fields = ["kind", "year", "month", *([group_field] if group_field else [])]
+    rows = (
+        _rollups(user, models)
+        .filter(_period_filter(buckets[0], end))
+        .values(*fields)
+        .annotate(total=Sum("total"))
+    )
+    for row in rows:
+        bucket = _bucket_start(datetime.date(row["year"], row["month"], 1), granularity)
+        yield row["kind"], bucket, row[group_field] if group_field else None, row["total"]
+
+
+def _ledger_bucket_rows(user, models, buckets, end, granularity, group_by):
+    group_field = GROUP_BY_FIELDS[group_by] if group_by else None
+    rows = (
+        LedgerEntry.objects.filter(
+            user=user,
+            kind__in=[model.CATEGORY_KIND for model in models],
+            date__range=(buckets[0], end),
         )
-        total = (
-            model.objects.filter(user=user, date__range=(month_start, month_end)).aggregate(total=Sum("amount"))[
-                "total"
-            ]
-            or Decimal("0")
+        .annotate(bucket=Trunc("date", granularity), group=F(group_field) if group_field else Value(""))
+        .order_by()
+        .values("kind", "bucket", "group")
+        .annotate(total=Sum("amount"))
+    )
+    for row in rows:
+        yield row["kind"], _coerce_date(row["bucket"]), row["group"] if group_field else None, row["total"]
+
+
+def _transaction_bucket_rows(user, models, buckets, end, granularity, group_by):
+    group_field = GROUP_BY_FIELDS[group_by] if group_by else None
+    querysets = []
+    for model in models:
+        queryset = model.objects.filter(user=user, date__range=(buckets[0], end)).annotate(
+            kind=Value(model.CATEGORY_KIND),
+            bucket=Trunc("date", granularity),
+            group=F(group_field) if group_field else Value(""),
         )
-        totals_map[month_start] = total
+        querysets.append(queryset.order_by().values("kind", "bucket", "group").annotate(total=Sum("amount")))
+    rows = querysets[0].union(*querysets[1:], all=True) if len(querysets) > 1 else querysets[0]
+    for row in rows:
+        yield row["kind"], _coerce_date(row["bucket"]), row["group"] if group_field else None, row["total"]
+
+
+def get_time_series(
+    user,
+    models,
+    start: datetime.date,
+    end: datetime.date,
+    granularity: str = "month",
+    group_by: str | None = None,
+) -> dict:
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularidad desconocida: {granularity}.")
+    if group_by is not None and group_by not in GROUP_BY_FIELDS:
+        raise ValueError(f"Dimensión desconocida: {group_by}.")
+    models = list(models) if isinstance(models, (list, tuple)) else [models]
+    if group_by in ("expense_type", "saving_type") and any(
+        not hasattr(model, group_by) for model in models
+    ):
+        raise ValueError(f"La dimensión {group_by} no aplica a todos los modelos.")
+    buckets = _buckets(_coerce_date(start), _coerce_date(end), granularity)
+    labels = [_bucket_label(bucket, granularity) for bucket in buckets]
+    if not buckets:
+        return {"buckets": [], "labels": [], "series": {} if group_by else {model: [] for model in models}}
+    period_end = _next_bucket(buckets[-1], granularity) - datetime.timedelta(days=1)
+    if granularity in ROLLUP_GRANULARITIES and group_by in (None, "category"):
+        rows = _rollup_bucket_rows(user, models, buckets, period_end, granularity, group_by)
+    elif group_by in LEDGER_GROUP_BY:
+        rows = _ledger_bucket_rows(user, models, buckets, period_end, granularity, group_by)
+    else:
+        rows = _transaction_bucket_rows(user, models, buckets, period_end, granularity, group_by)
+    positions = {bucket: index for index, bucket in enumerate(buckets)}
+    kinds = {model.CATEGORY_KIND: model for model in models}
+    series = {} if group_by else {model: [0.0] * len(buckets) for model in models}
+    for kind, bucket, group, total in rows:
+        key = (kinds[kind], group) if group_by else kinds[kind]
+        values = series.setdefault(key, [0.0] * len(buckets))
+        values[positions[bucket]] += float(total or 0)
+    return {"buckets": buckets, "labels": labels, "series": series}
+
 
-    labels = [month.isoformat() for month in months]
-    data = [float(totals_map.get(month, 0) or 0) for month in months]
-    return {"labels": labels, "data": data}
+def _series_for_models(result: dict, models, labels: list[str]) -> dict:
+    return {model: {"labels": list(labels), "data": result["series"][model]} for model in models}
+
+
+def get_last_12_months_series_for_models(user, models) -> dict:
+    today = timezone.localdate()
+    start_month = (today.replace(day=1) - datetime.timedelta(days=365)).replace(day=1)
+    result = get_time_series(user, models, start_month, _add_months(start_month, 11), "month")
+    return _series_for_models(result, models, [bucket.isoformat() for bucket in result["buckets"]])
+
+
+def get_last_12_months_series(user, model):
+    return get_last_12_months_series_for_models(user, [model])[model]
+
+
+def get_last_periods_series(user, model, granularity: str = "month", periods: int = 12) -> dict:
+    today = timezone.localdate()
+    start = _bucket_start(today, granularity)
+    for _ in range(periods - 1):
+        start = _bucket_start(start - datetime.timedelta(days=1), granularity)
+    result = get_time_series(user, [model], start, today, granularity)
+    return {"labels": result["labels"], "data": result["series"][model]}
+
+
+def get_year_12_months_series_for_models(models, user, year: int) -> dict:
+    result = get_time_series(user, models, datetime.date(year, 1, 1), datetime.date(year, 12, 31), "month")
+    return _series_for_models(result, models, result["labels"])
 
 
 def get_year_12_months_series(model, user, year: int):
-    labels = []
-    data = []
-    for month in range(1, 13):
-        start, end = _month_range(year, month)
-        total = (
-            model.objects.filter(user=user, date__range=(start, end)).aggregate(total=Sum("amount"))["total"]
-            or Decimal("0")
-        )
-        labels.append(f"{year}-{month:02d}")
-        data.append(float(total))
-    return {"labels": labels, "data": data}
+    return get_year_12_months_series_for_models([model], user, year)[model]
+
+
+def get_yearly_overview_series(user, year: int) -> dict:
+    series = get_year_12_months_series_for_models([Income, FixedExpense, VariableExpense, Saving], user, year)
+    expense_data = [
+        fixed + variable
+        for fixed, variable in zip(series[FixedExpense]["data"], series[VariableExpense]["data"], strict=False)
+    ]
+    return {
+        "income": series[Income],
+        "expense": {"labels": series[Income]["labels"], "data": expense_data},
+        "saving": series[Saving],
+    }
 
 
 def get_saving_goal_progress(user):
     goals = SavingGoal.objects.filter(user=user, is_active=True)
     progress = []
     for goal in goals:
-        total_saved = goal.savings.aggregate(total=Sum("amount"))["total"] or Decimal("0")
+        total_saved = goal.total_saved
         target = goal.target_amount
         remaining = max(target - total_saved, Decimal("0"))
         progress_pct = (total_saved / target * Decimal("100")) if target else Decimal("0")
@@ -152,12 +347,12 @@ def get_saving_distribution(user, year: int):
     return {"labels": labels, "data": values}
 
 
-def get_category_breakdown(user, model, year: int, month: int):
-    start, end = _month_range(year, month)
+def _category_breakdown(user, models, year: int, month: int):
     data = (
-        model.objects.filter(user=user, date__range=(start, end))
+        _rollups(user, models)
+        .filter(year=year, month=month)
         .values("category__name")
-        .annotate(total=Sum("amount"))
+        .annotate(total=Sum("total"))
         .order_by("-total")
     )
     labels = [item["category__name"] for item in data]
@@ -165,20 +360,112 @@ def get_category_breakdown(user, model, year: int, month: int):
     return {"labels": labels, "data": values}
 
 
+def get_category_breakdown(user, model, year: int, month: int):
+    return _category_breakdown(user, [model], year, month)
+
+
+def get_expense_category_breakdown(user, year: int, month: int):
+    return _category_breakdown(user, [FixedExpense, VariableExpense], year, month)
+
+
+def get_top_expenses(user, year: int, month: int, limit: int = 10, category_kind: str | None = None):
+    start, end = _month_range(year, month)
+    entries = LedgerEntry.objects.filter(user=user, kind__in=EXPENSE_KINDS, date__range=(start, end))
+    if category_kind:
+        entries = entries.filter(category__kind=category_kind)
+    return [
+        {"description": item["description"], "amount": item["amount"], "category": item["category__name"]}
+        for item in entries.order_by("-amount").values("description", "amount", "category__name")[:limit]
+    ]
+
+
 def get_daily_series(user, model, year: int, month: int):
     start, end = _month_range(year, month)
-    data = (
-        model.objects.filter(user=user, date__range=(start, end))
-        .values("date")
+    result = get_time_series(user, [model], start, end, "day")
+    return {"labels": result["labels"], "data": result["series"][model]}
+
+
+def _pending_fixed_by_category(user, year: int, month: int) -> dict:
+    return dict(
+        pending_templates(year, month, [user.pk])
+        .order_by()
+        .values("category_id")
         .annotate(total=Sum("amount"))
-        .order_by("date")
+        .values_list("category_id", "total")
     )
-    totals_map = {_coerce_date(item["date"]): item["total"] for item in data}
-    last_day = calendar.monthrange(year, month)[1]
-    labels = []
-    values = []
-    for day in range(1, last_day + 1):
-        current_day = datetime.date(year, month, day)
-        labels.append(current_day.isoformat())
-        values.append(float(totals_map.get(current_day, 0) or 0))
-    return {"labels": labels, "data": values}
+
+
+def _projected_spend(kind: str, spent: Decimal, pending: Decimal, year: int, month: int, today: datetime.date):
+    start, end = _month_range(year, month)
+    if end < today:
+        return spent
+    if kind == Category.KIND_FIXED:
+        return (spent + pending).quantize(CENT)
+    if start > today:
+        return spent
+    return (spent / today.day * end.day).quantize(CENT)
+
+
+def _budget_status_label(spent: Decimal, projected: Decimal, budget: Decimal) -> str:
+    if spent > budget:
+        return "Excedido"
+    if projected > budget:
+        return "En riesgo"
+    return "En curso"
+
+
+def get_budget_status(user, year: int, month: int, today: datetime.date | None = None) -> dict:
+    today = today or timezone.localdate()
+    spent = MonthlyRollup.objects.filter(
+        user=user,
+        kind=OuterRef("category__kind"),
+        year=year,
+        month=month,
+        category=OuterRef("category"),
+    ).values("total")[:1]
+    budgets = (
+        CategoryBudget.objects.filter(user=user, is_active=True, category__kind__in=EXPENSE_KINDS)
+        .annotate(spent=Coalesce(Subquery(spent), Value(Decimal("0")), output_field=DecimalField()))
+        .values("pk", "amount", "spent", "category_id", "category__name", "category__kind")
+    )
+    budgets = list(budgets)
+    pending = {}
+    if _month_range(year, month)[1] >= today and any(
+        item["category__kind"] == Category.KIND_FIXED for item in budgets
+    ):
+        pending = _pending_fixed_by_category(user, year, month)
+    kind_labels = dict(Category.KIND_CHOICES)
+    rows = []
+    totals = {"budget": Decimal("0"), "spent": Decimal("0"), "projected": Decimal("0"), "overrun": Decimal("0")}
+    for item in budgets:
+        budget, spent_total = item["amount"], item["spent"].quantize(CENT)
+        projected = _projected_spend(
+            item["category__kind"],
+            spent_total,
+            pending.get(item["category_id"], Decimal("0")),
+            year,
+            month,
+            today,
+        )
+        overrun = max(projected - budget, Decimal("0"))
+        rows.append(
+            {
+                "id": item["pk"],
+                "category": item["category__name"],
+                "kind": kind_labels[item["category__kind"]],
+                "budget": budget,
+                "spent": spent_total,
+                "remaining": max(budget - spent_total, Decimal("0")),
+                "used_pct": (spent_total / budget * Decimal("100")) if budget else Decimal("0"),
+                "projected": projected,
+                "projected_pct": (projected / budget * Decimal("100")) if budget else Decimal("0"),
+                "overrun": overrun,
+                "status": _budget_status_label(spent_total, projected, budget),
+            }
+        )
+        totals["budget"] += budget
+        totals["spent"] += spent_total
+        totals["projected"] += projected
+        totals["overrun"] += overrun
+    totals["used_pct"] = (totals["spent"] / totals["budget"] * Decimal("100")) if totals["budget"] else Decimal("0")
+    return {"budgets": rows, "totals": totals}
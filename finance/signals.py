@@ -0,0 +1,141 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from finance.caching import bump_data_version_on_commit, invalidate_form_choices_on_commit
+from finance.ledger import remove_ledger_entries, sync_ledger_entry
+from finance.models import Category, CategoryBudget, PaymentMethod, RecurringFixedExpense, Saving, SavingGoal
+from finance.rollups import (
+    TRANSACTION_MODELS,
+    add_delta,
+    add_goal_delta,
+    apply_deltas,
+    apply_goal_deltas,
+    rollup_key,
+)
+from finance.search import index_transactions, unindex_transactions
+
+TRACKED_FIELDS = ("user_id", "date", "category_id", "amount", "goal_id")
+
+
+def _tracked_fields(sender) -> tuple:
+    return TRACKED_FIELDS if sender is Saving else TRACKED_FIELDS[:-1]
+
+
+def _tracked_state(sender, instance) -> dict:
+    return {field: getattr(instance, field) for field in _tracked_fields(sender)}
+
+
+def _add_state_deltas(sender, state: dict, sign: int, deltas: dict, goal_deltas: dict) -> None:
+    key = rollup_key(state["user_id"], sender.CATEGORY_KIND, state["date"], state["category_id"])
+    add_delta(deltas, key, state["amount"], sign)
+    add_goal_delta(goal_deltas, state.get("goal_id"), state["amount"], sign)
+
+
+def _apply_state_deltas(deltas: dict, goal_deltas: dict) -> None:
+    with transaction.atomic():
+        apply_deltas(deltas)
+        apply_goal_deltas(goal_deltas)
+
+
+def _locked_state(sender, instance, using) -> dict | None:
+    rows = sender._base_manager.using(using).select_for_update().filter(pk=instance.pk)
+    return rows.values(*_tracked_fields(sender)).first()
+
+
+def remember_previous_state(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    instance._tracked_previous = None
+    if instance.pk is not None:
+        instance._tracked_previous = _locked_state(sender, instance, using)
+
+
+def remember_deleted_state(sender, instance, using=None, **kwargs):
+    instance._tracked_previous = _locked_state(sender, instance, using)
+
+
+def update_derived_totals_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    deltas, goal_deltas = {}, {}
+    previous = getattr(instance, "_tracked_previous", None)
+    if previous is not None:
+        _add_state_deltas(sender, previous, -1, deltas, goal_deltas)
+    _add_state_deltas(sender, _tracked_state(sender, instance), 1, deltas, goal_deltas)
+    _apply_state_deltas(deltas, goal_deltas)
+    instance._tracked_previous = None
+
+
+def update_derived_totals_on_delete(sender, instance, **kwargs):
+    previous = getattr(instance, "_tracked_previous", None)
+    if previous is None:
+        return
+    deltas, goal_deltas = {}, {}
+    _add_state_deltas(sender, previous, -1, deltas, goal_deltas)
+    _apply_state_deltas(deltas, goal_deltas)
+    instance._tracked_previous = None
+
+
+def update_search_index_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    index_transactions(sender, [instance.pk])
+
+
+def update_search_index_on_delete(sender, instance, **kwargs):
+    unindex_transactions(sender, [instance.pk])
+
+
+def update_ledger_on_save(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    sync_ledger_entry(sender, instance, created)
+
+
+def update_ledger_on_delete(sender, instance, **kwargs):
+    remove_ledger_entries(sender, [instance.pk])
+
+
+def reindex_goal_savings(sender, instance, created=False, raw=False, **kwargs):
+    if created or raw:
+        return
+    index_transactions(Saving, instance.savings.values_list("pk", flat=True))
+
+
+def remember_goal_savings(sender, instance, **kwargs):
+    instance._indexed_savings = list(instance.savings.values_list("pk", flat=True))
+
+
+def reindex_deleted_goal_savings(sender, instance, **kwargs):
+    index_transactions(Saving, getattr(instance, "_indexed_savings", []))
+
+
+def invalidate_user_data(sender, instance, **kwargs):
+    bump_data_version_on_commit(instance.user_id)
+
+
+def invalidate_user_choices(sender, instance, **kwargs):
+    invalidate_form_choices_on_commit(instance.user_id)
+
+
+for model in TRANSACTION_MODELS:
+    pre_save.connect(remember_previous_state, sender=model)
+    post_save.connect(update_derived_totals_on_save, sender=model)
+    pre_delete.connect(remember_deleted_state, sender=model)
+    post_delete.connect(update_derived_totals_on_delete, sender=model)
+    post_save.connect(update_search_index_on_save, sender=model)
+    post_delete.connect(update_search_index_on_delete, sender=model)
+    post_save.connect(update_ledger_on_save, sender=model)
+    post_delete.connect(update_ledger_on_delete, sender=model)
+
+post_save.connect(reindex_goal_savings, sender=SavingGoal)
+pre_delete.connect(remember_goal_savings, sender=SavingGoal)
+post_delete.connect(reindex_deleted_goal_savings, sender=SavingGoal)
+
+for model in [*TRANSACTION_MODELS, Category, PaymentMethod, SavingGoal, CategoryBudget, RecurringFixedExpense]:
+    post_save.connect(invalidate_user_data, sender=model)
+    post_delete.connect(invalidate_user_data, sender=model)
+
+for model in [Category, PaymentMethod, SavingGoal]:
+    post_save.connect(invalidate_user_choices, sender=model)
+    post_delete.connect(invalidate_user_choices, sender=model)
@@ -0,0 +1,69 @@
+(function () {
+    const moneyFormat = new Intl.NumberFormat('es-ES', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    const percentFormat = new Intl.NumberFormat('es-ES', {minimumFractionDigits: 1, maximumFractionDigits: 1});
+
+    function formatNumber(value) {
+        return moneyFormat.format(Number(value));
+    }
+
+    function formatMoney(value) {
+        return '$' + formatNumber(value);
+    }
+
+    function formatPercent(value) {
+        return percentFormat.format(Number(value)) + '%';
+    }
+
+    function setText(root, selector, value) {
+        root.querySelectorAll(selector).forEach((element) => {
+            element.textContent = value;
+        });
+    }
+
+    function setChartData(chart, labels, datasets) {
+        chart.data.labels = labels;
+        datasets.forEach((data, index) => {
+            chart.data.datasets[index].data = data;
+        });
+        chart.update();
+    }
+
+    async function fetchDataset(endpoint, name, params) {
+        const url = endpoint.replace('__dataset__', name) + '?' + new URLSearchParams(params);
+        // "no-cache" revalidates with If-None-Match; unchanged datasets come back as 304 and are served from cache.
+        const response = await fetch(url, {credentials: 'same-origin', cache: 'no-cache'});
+        if (!response.ok) {
+            throw new Error(`No se pudo cargar ${name} (${response.status})`);
+        }
+        return response.json();
+    }
+
+    function bindDashboard({form, endpoint, module, monthNames, datasets}) {
+        let current = {year: form.elements.year.value, month: form.elements.month.value};
+
+        form.addEventListener('submit', async (event) => {
+            event.preventDefault();
+            const next = {year: form.elements.year.value, month: form.elements.month.value};
+            const changed = Object.keys(next).filter((key) => next[key] !== current[key]);
+            if (!changed.length) {
+                return;
+            }
+            const params = module ? {...next, module} : next;
+            const names = Object.keys(datasets).filter((name) => datasets[name].depends.some((key) => changed.includes(key)));
+            try {
+                const results = await Promise.all(names.map((name) => fetchDataset(endpoint, name, params)));
+                names.forEach((name, index) => datasets[name].render(results[index]));
+            } catch (error) {
+                form.submit();
+                return;
+            }
+            current = next;
+            setText(document, '[data-period="year"]', next.year);
+            setText(document, '[data-period="month"]', next.month);
+            setText(document, '[data-period="month-name"]', monthNames[Number(next.month)]);
+            window.history.replaceState(null, '', '?' + new URLSearchParams(next));
+        });
+    }
+
+    window.MoneyManager = {bindDashboard, fetchDataset, formatMoney, formatNumber, formatPercent, setChartData, setText};
+})();
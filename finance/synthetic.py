@@ -0,0 +1,139 @@
+import calendar
+import datetime
+import random
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from finance.caching import bump_data_version_on_commit
+from finance.ledger import add_ledger_entries
+from finance.models import Category, FixedExpense, Income, PaymentMethod, Saving, SavingGoal, VariableExpense
+from finance.rollups import rebuild_goal_totals, rebuild_user_rollups
+from finance.search import index_new_transactions
+
+CATEGORY_NAMES = {
+    Category.KIND_INCOME: ["Salario", "Freelance", "Inversiones", "Otros ingresos"],
+    Category.KIND_FIXED: ["Arriendo", "Servicios", "Internet", "Seguros", "Suscripciones"],
+    Category.KIND_VARIABLE: ["Mercado", "Restaurantes", "Transporte", "Ocio", "Salud", "Ropa"],
+    Category.KIND_SAVING: ["Fondo de emergencia", "Inversión", "Viajes"],
+}
+PAYMENT_METHOD_NAMES = ["Efectivo", "Tarjeta de crédito", "Tarjeta débito", "Transferencia"]
+GOALS = [
+    ("Fondo de emergencia", Decimal("6000")),
+    ("Vacaciones", Decimal("3500")),
+    ("Auto nuevo", Decimal("25000")),
+]
+KIND_WEIGHTS = [
+    (Income, 10),
+    (FixedExpense, 15),
+    (VariableExpense, 65),
+    (Saving, 10),
+]
+AMOUNT_RANGES = {
+    Income: (1200, 6000),
+    FixedExpense: (30, 1500),
+    VariableExpense: (3, 250),
+    Saving: (50, 800),
+}
+DESCRIPTIONS = {
+    Income: ["Pago nómina", "Proyecto freelance", "Dividendos", "Reembolso", "Venta de artículo"],
+    FixedExpense: ["Pago arriendo", "Factura de luz", "Factura de agua", "Plan de internet", "Seguro del auto"],
+    VariableExpense: ["Compra supermercado", "Almuerzo", "Taxi", "Cine", "Farmacia", "Café", "Gasolina", "Regalo"],
+    Saving: ["Aporte mensual", "Transferencia a ahorro", "Compra de fondo", "Ahorro extra"],
+}
+SOURCES = ["Empresa S.A.", "Cliente externo", "Broker", "Familia"]
+
+
+def _months(years: int, today: datetime.date):
+    year, month = today.year - years, today.month
+    for _ in range(years * 12):
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+        yield year, month
+
+
+def _extra_fields(model, rng, goals) -> dict:
+    if model is Income:
+        return {"source": rng.choice(SOURCES)}
+    if model is FixedExpense:
+        return {"is_paid": rng.random() < 0.8, "due_day": rng.randint(1, 28)}
+    if model is VariableExpense:
+        return {"expense_type": rng.choice([VariableExpense.TYPE_NECESSARY, VariableExpense.TYPE_WANT])}
+    goal = rng.choice([*goals, None])
+    return {
+        "saving_type": rng.choice([choice for choice, _ in Saving.SAVING_TYPE_CHOICES]),
+        "goal": goal,
+        "goal_name": goal.name if goal else "",
+        "goal_amount": goal.target_amount if goal else None,
+    }
+
+
+def seed_user(user, years: int, per_month: int, rng, today=None, batch_size: int = 2000) -> int:
+    today = today or datetime.date.today()
+    categories = {
+        kind: Category.objects.bulk_create([Category(user=user, name=name, kind=kind) for name in names])
+        for kind, names in CATEGORY_NAMES.items()
+    }
+    payment_methods = PaymentMethod.objects.bulk_create(
+        [PaymentMethod(user=user, name=name) for name in PAYMENT_METHOD_NAMES]
+    )
+    goals = SavingGoal.objects.bulk_create(
+        [SavingGoal(user=user, name=name, target_amount=target) for name, target in GOALS]
+    )
+    models = [model for model, _ in KIND_WEIGHTS]
+    weights = [weight for _, weight in KIND_WEIGHTS]
+    pending = {model: [] for model in models}
+    created = 0
+    for year, month in _months(years, today):
+        last_day = calendar.monthrange(year, month)[1]
+        for model in rng.choices(models, weights=weights, k=per_month):
+            low, high = AMOUNT_RANGES[model]
+            pending[model].append(
+                model(
+                    user=user,
+                    date=datetime.date(year, month, rng.randint(1, last_day)),
+                    amount=Decimal(rng.randint(low * 100, high * 100)) / 100,
+                    category=rng.choice(categories[model.CATEGORY_KIND]),
+                    description=rng.choice(DESCRIPTIONS[model]),
+                    payment_method=rng.choice(payment_methods),
+                    notes=rng.choice(["", "", "", "Pago recurrente", "Revisar en el extracto"]),
+                    **_extra_fields(model, rng, goals),
+                )
+            )
+            if len(pending[model]) >= batch_size:
+                created += _flush(model, pending[model])
+    for model, instances in pending.items():
+        created += _flush(model, instances)
+    rebuild_user_rollups(user.pk)
+    rebuild_goal_totals(user.pk)
+    bump_data_version_on_commit(user.pk)
+    return created
+
+
+def _flush(model, instances: list) -> int:
+    if not instances:
+        return 0
+    created = model.objects.bulk_create(instances)
+    index_new_transactions(model, created)
+    add_ledger_entries(model, created)
+    count = len(instances)
+    instances.clear()
+    return count
+
+
+def seed_users(users: int, years: int, per_month: int, prefix: str = "demo", password: str = "demo", seed=None) -> dict:
+    User = get_user_model()
+    rng = random.Random(seed)
+    password_hash = make_password(password)
+    created = {}
+    for index in range(1, users + 1):
+        username = f"{prefix}{index}"
+        if User.objects.filter(username=username).exists():
+            continue
+        with transaction.atomic():
+            user = User.objects.create(username=username, password=password_hash)
+            created[username] = seed_user(user, years, per_month, rng)
+    return created
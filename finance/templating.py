@@ -0,0 +1,17 @@
+from django.template.backends.django import DjangoTemplates, Template
+
+from finance.middleware import track_template
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        with track_template():
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
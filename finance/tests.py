@@ -0,0 +1,720 @@
+import csv
+import datetime
+import io
+import json
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from finance import importers, views
+from finance.bulk import bulk_delete_transactions, bulk_update_transactions
+from finance.ledger import LEDGER_FIELDS, diff_user_ledger, rebuild_user_ledger
+from finance.models import (
+    Category,
+    CategoryBudget,
+    FixedExpense,
+    Income,
+    LedgerEntry,
+    MonthlyRollup,
+    PaymentMethod,
+    RecurringFixedExpense,
+    Saving,
+    SavingGoal,
+    VariableExpense,
+)
+from finance.query_plans import assert_no_full_scans
+from finance.recompute import default_workers, recompute_user, recompute_users
+from finance.recurring import materialize_month
+from finance.services import get_budget_status
+from finance.rollups import diff_goal_totals, diff_user_rollups
+
+LIST_VIEWS = [
+    ("income_list", views.IncomeListView),
+    ("fixed_expense_list", views.FixedExpenseListView),
+    ("variable_expense_list", views.VariableExpenseListView),
+    ("saving_list", views.SavingListView),
+]
+ROWS_PER_MODEL = 60
+
+
+def seed_transactions(user, rows: int = ROWS_PER_MODEL) -> None:
+    payment_methods = [PaymentMethod.objects.create(user=user, name=f"Método {index}") for index in range(2)]
+    goal = SavingGoal.objects.create(user=user, name="Meta", target_amount=Decimal("1000"))
+    for model in (Income, FixedExpense, VariableExpense, Saving):
+        categories = [
+            Category.objects.create(user=user, name=f"{model.CATEGORY_KIND} {index}", kind=model.CATEGORY_KIND)
+            for index in range(3)
+        ]
+        for index in range(rows):
+            extra = {}
+            if model is Income:
+                extra = {"source": "Empresa"}
+            elif model is VariableExpense:
+                extra = {"expense_type": VariableExpense.TYPE_WANT}
+            elif model is Saving:
+                extra = {"goal": goal if index % 2 else None, "goal_name": goal.name if index % 2 else ""}
+            model.objects.create(
+                user=user,
+                date=datetime.date(2025, 1, 1) + datetime.timedelta(days=index * 5),
+                amount=Decimal(10 + index),
+                category=categories[index % len(categories)],
+                description=f"Movimiento {index}",
+                payment_method=payment_methods[index % len(payment_methods)],
+                **extra,
+            )
+
+
+class ListViewQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("listas", password="x")
+        seed_transactions(cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def _query_count(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(context.captured_queries)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        for name, view_class in LIST_VIEWS:
+            with self.subTest(view=name):
+                url = reverse(name)
+                self.client.get(url)
+                with mock.patch.object(view_class, "paginate_by", 10):
+                    expected = self._query_count(url)
+                with mock.patch.object(view_class, "paginate_by", 50), self.assertNumQueries(expected):
+                    self.client.get(url)
+
+
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("planes", password="x")
+        seed_transactions(cls.user)
+        other = get_user_model().objects.create_user("otro", password="x")
+        seed_transactions(other)
+
+    def test_service_queries_use_indexes(self):
+        assert_no_full_scans(self.user, 2025, 3)
+
+
+class SavingGoalTotalsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("metas", password="x")
+        seed_transactions(cls.user, rows=6)
+
+    def assertTotalsConsistent(self):
+        self.assertEqual(diff_goal_totals(self.user.pk), {})
+        self.assertEqual(diff_user_rollups(self.user.pk), {})
+
+    def test_editing_amount_and_goal_keeps_totals(self):
+        other_goal = SavingGoal.objects.create(user=self.user, name="Otra meta", target_amount=Decimal("500"))
+        saving = Saving.objects.filter(user=self.user, goal__isnull=False).first()
+        saving.amount = Decimal("321.45")
+        saving.save()
+        self.assertTotalsConsistent()
+        saving.goal = other_goal
+        saving.goal_name = other_goal.name
+        saving.date = saving.date + datetime.timedelta(days=40)
+        saving.save()
+        self.assertTotalsConsistent()
+        self.assertEqual(SavingGoal.objects.get(pk=other_goal.pk).total_saved, Decimal("321.45"))
+
+    def test_stale_instance_uses_stored_row(self):
+        saving = Saving.objects.filter(user=self.user, goal__isnull=False).first()
+        stale = Saving.objects.get(pk=saving.pk)
+        saving.amount += Decimal("75")
+        saving.save()
+        stale.description = "Editado"
+        stale.save()
+        self.assertTotalsConsistent()
+        stale.delete()
+        self.assertTotalsConsistent()
+        saving.delete()
+        self.assertTotalsConsistent()
+
+
+class RecomputeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("recalculo", password="x")
+        seed_transactions(cls.user, rows=12)
+
+    def corrupt_derived_data(self):
+        MonthlyRollup.objects.filter(user=self.user).update(total=Decimal("1"))
+        SavingGoal.objects.filter(user=self.user).update(total_saved=Decimal("0"))
+        LedgerEntry.objects.filter(user=self.user, kind=Category.KIND_INCOME).delete()
+
+    def assertDerivedDataConsistent(self):
+        self.assertEqual(diff_user_rollups(self.user.pk), {})
+        self.assertEqual(diff_goal_totals(self.user.pk), {})
+        self.assertEqual(diff_user_ledger(self.user.pk), {})
+
+    def test_recompute_user_rebuilds_derived_data(self):
+        self.corrupt_derived_data()
+        result = recompute_user(self.user.pk, verify=True)
+        self.assertNotIn("error", result)
+        self.assertEqual(result["mismatches"], 0)
+        self.assertEqual(result["entries"], 4 * 12)
+        self.assertDerivedDataConsistent()
+
+    def test_recompute_users_runs_sequentially_with_one_worker(self):
+        self.corrupt_derived_data()
+        results = list(recompute_users([self.user.pk], workers=4, verify=True))
+        self.assertEqual([result["user_id"] for result in results], [self.user.pk])
+        self.assertDerivedDataConsistent()
+
+    @override_settings(FINANCE_SQLITE_PRAGMAS={})
+    def test_sqlite_without_busy_timeout_defaults_to_one_worker(self):
+        self.assertEqual(default_workers(), 1)
+
+
+class AsyncDashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("tableros", password="x")
+        seed_transactions(cls.user, rows=12)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_dashboards_render_inside_a_transaction(self):
+        for name in (
+            "dashboard_general",
+            "income_dashboard",
+            "fixed_expense_dashboard",
+            "variable_expense_dashboard",
+            "saving_dashboard",
+            "budget_dashboard",
+        ):
+            with self.subTest(dashboard=name):
+                response = self.client.get(reverse(name), {"year": 2025, "month": 2})
+                self.assertEqual(response.status_code, 200)
+
+
+class CsvReaderTests(TestCase):
+    def read(self, text: str) -> list:
+        return list(importers.read_csv(io.StringIO(text, newline="")))
+
+    def test_maps_column_aliases_and_skips_blank_rows(self):
+        rows = self.read(
+            "Fecha,Importe,Concepto,Categoría\n2025-03-01,10,Pan,Comida\n,,,\n01/03/2025,5,Leche,Comida\n"
+        )
+        self.assertEqual(
+            rows,
+            [
+                (2, {"date": "2025-03-01", "amount": "10", "description": "Pan", "category": "Comida"}),
+                (4, {"date": "01/03/2025", "amount": "5", "description": "Leche", "category": "Comida"}),
+            ],
+        )
+
+    def test_requires_date_and_amount_columns(self):
+        with self.assertRaisesMessage(ValueError, "no tiene columna de monto"):
+            self.read("fecha,descripcion\n2025-03-01,Pan\n")
+
+    def test_reports_malformed_file_with_line(self):
+        with self.assertRaisesMessage(ValueError, "no es válido en la línea 3"):
+            self.read("fecha,monto,descripcion\n2025-03-01,10,Pan\n2025-03-02,5," + "x" * 200000 + "\n")
+
+
+class OfxReaderTests(TestCase):
+    def test_reads_records_split_across_chunks(self):
+        text = (
+            "OFXHEADER:100\n<OFX><BANKTRANLIST>"
+            "<STMTTRN><DTPOSTED>20250301120000<TRNAMT>-12.50<NAME>Panadería<MEMO>Desayuno</STMTTRN>"
+            "<STMTTRN><DTPOSTED>20250302<TRNAMT>100.00<MEMO>Transferencia</STMTTRN>"
+            "</BANKTRANLIST></OFX>"
+        )
+        with mock.patch.object(importers, "OFX_CHUNK_SIZE", 7):
+            records = [(line, importers.ofx_record(record)) for line, record in importers.read_ofx(io.StringIO(text))]
+        self.assertEqual(
+            records,
+            [
+                (
+                    1,
+                    {
+                        "date": "20250301120000",
+                        "amount": "-12.50",
+                        "description": "Panadería",
+                        "notes": "Desayuno",
+                        "source": "Panadería",
+                    },
+                ),
+                (
+                    2,
+                    {
+                        "date": "20250302",
+                        "amount": "100.00",
+                        "description": "Transferencia",
+                        "notes": "",
+                        "source": "Transferencia",
+                    },
+                ),
+            ],
+        )
+        self.assertEqual(importers.parse_date("20250301120000"), datetime.date(2025, 3, 1))
+        self.assertEqual(importers.parse_amount("-12.50"), Decimal("12.50"))
+
+
+class ImportTransactionsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("importador", password="x")
+        Category.objects.create(user=cls.user, name="Alimentación", kind=Category.KIND_VARIABLE)
+        PaymentMethod.objects.create(user=cls.user, name="Débito")
+
+    def import_bytes(self, data: bytes, file_format: str = "csv"):
+        return importers.import_transactions(self.user, VariableExpense, io.BytesIO(data), file_format)
+
+    def test_imports_cp1252_file(self):
+        text = "fecha,monto,descripción,categoría,método\n2025-03-01,\"1.234,50\",Café,Alimentación,Débito\n"
+        result = self.import_bytes(text.encode("cp1252"))
+        self.assertEqual((result.created, result.errors), (1, []))
+        expense = VariableExpense.objects.get(user=self.user)
+        self.assertEqual((expense.description, expense.amount), ("Café", Decimal("1234.50")))
+
+    def test_reports_row_errors_without_stopping(self):
+        text = (
+            "fecha,monto,descripcion,categoria,metodo\n"
+            "2025-03-01,abc,Pan,Alimentación,Débito\n"
+            "2025-03-02,3,Pan,Otra,Débito\n"
+            "2025-03-03,4,Pan,Alimentación,Débito\n"
+        )
+        result = self.import_bytes(text.encode())
+        self.assertEqual(result.created, 1)
+        self.assertEqual(
+            result.errors,
+            [(2, "Monto inválido: 'abc'."), (3, "No se encontró la categoría 'Otra'.")],
+        )
+
+    def test_invalid_bytes_are_an_encoding_error(self):
+        data = "fecha,monto,descripcion\n".encode() + b"2025-03-01,10,Caf\xc3\n" + b"2025-03-02,10,\x81\x8d\n"
+        with self.assertRaisesMessage(ValueError, "caracteres inválidos"):
+            self.import_bytes(data)
+
+
+class MonthlyRollupSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("totales", password="x")
+        seed_transactions(cls.user, rows=6)
+
+    def rollup(self, model, year: int, month: int, category) -> tuple:
+        row = MonthlyRollup.objects.filter(
+            user=self.user, kind=model.CATEGORY_KIND, year=year, month=month, category=category
+        ).first()
+        return (row.total, row.count) if row else (Decimal("0"), 0)
+
+    def test_create_edit_move_and_delete_keep_rollups_in_sync(self):
+        for model in (Income, FixedExpense, VariableExpense, Saving):
+            with self.subTest(model=model.__name__):
+                instance = model.objects.filter(user=self.user).first()
+                category = instance.category
+                other_category = (
+                    Category.objects.filter(user=self.user, kind=model.CATEGORY_KIND).exclude(pk=category.pk).first()
+                )
+                instance.pk = None
+                instance.date = datetime.date(2030, 1, 15)
+                instance.amount = Decimal("100.10")
+                instance.save()
+                self.assertEqual(self.rollup(model, 2030, 1, category), (Decimal("100.10"), 1))
+                instance.amount = Decimal("40.05")
+                instance.save()
+                self.assertEqual(self.rollup(model, 2030, 1, category), (Decimal("40.05"), 1))
+                instance.date = datetime.date(2030, 2, 1)
+                instance.category = other_category
+                instance.save()
+                self.assertEqual(self.rollup(model, 2030, 1, category), (Decimal("0"), 0))
+                self.assertEqual(self.rollup(model, 2030, 2, other_category), (Decimal("40.05"), 1))
+                self.assertEqual(diff_user_rollups(self.user.pk), {})
+                instance.delete()
+                self.assertEqual(self.rollup(model, 2030, 2, other_category), (Decimal("0"), 0))
+                self.assertEqual(diff_user_rollups(self.user.pk), {})
+
+
+class LedgerSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("libro", password="x")
+        seed_transactions(cls.user, rows=6)
+
+    def entry_values(self, model, pk: int) -> tuple:
+        return LedgerEntry.objects.filter(kind=model.CATEGORY_KIND, source_id=pk).values_list(*LEDGER_FIELDS).get()
+
+    def test_entries_follow_transaction_changes(self):
+        payment_method = PaymentMethod.objects.create(user=self.user, name="Efectivo")
+        for model in (Income, FixedExpense, VariableExpense, Saving):
+            with self.subTest(model=model.__name__):
+                instance = model.objects.filter(user=self.user).first()
+                instance.pk = None
+                instance.save()
+                self.assertEqual(
+                    self.entry_values(model, instance.pk),
+                    tuple(getattr(instance, field) for field in LEDGER_FIELDS),
+                )
+                instance.date = datetime.date(2030, 5, 2)
+                instance.amount = Decimal("77.70")
+                instance.payment_method = payment_method
+                instance.description = "Cambiado"
+                instance.save()
+                self.assertEqual(
+                    self.entry_values(model, instance.pk),
+                    (
+                        self.user.pk,
+                        datetime.date(2030, 5, 2),
+                        Decimal("77.70"),
+                        instance.category_id,
+                        payment_method.pk,
+                        "Cambiado",
+                        instance.notes,
+                    ),
+                )
+                self.assertEqual(diff_user_ledger(self.user.pk), {})
+                pk = instance.pk
+                instance.delete()
+                self.assertFalse(LedgerEntry.objects.filter(kind=model.CATEGORY_KIND, source_id=pk).exists())
+                self.assertEqual(diff_user_ledger(self.user.pk), {})
+
+    def test_rebuild_restores_missing_entries(self):
+        LedgerEntry.objects.filter(user=self.user, kind=Category.KIND_SAVING).delete()
+        self.assertIn(Category.KIND_SAVING, diff_user_ledger(self.user.pk))
+        self.assertEqual(rebuild_user_ledger(self.user.pk), 4 * 6)
+        self.assertEqual(diff_user_ledger(self.user.pk), {})
+
+
+class BulkActionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("masivo", password="x")
+        seed_transactions(cls.user, rows=30)
+        cls.other = get_user_model().objects.create_user("ajeno", password="x")
+        seed_transactions(cls.other, rows=6)
+
+    def assertDerivedDataConsistent(self):
+        for user in (self.user, self.other):
+            self.assertEqual(diff_user_rollups(user.pk), {})
+            self.assertEqual(diff_goal_totals(user.pk), {})
+            self.assertEqual(diff_user_ledger(user.pk), {})
+
+    def test_bulk_update_moves_rollups_to_new_category(self):
+        queryset = VariableExpense.objects.filter(user=self.user, date__year=2025, date__month__lte=3)
+        pks = list(queryset.values_list("pk", flat=True))
+        category = Category.objects.filter(user=self.user, kind=Category.KIND_VARIABLE).last()
+        self.assertEqual(bulk_update_transactions(VariableExpense, queryset, category_id=category.pk), len(pks))
+        self.assertEqual(VariableExpense.objects.filter(pk__in=pks, category=category).count(), len(pks))
+        entries = LedgerEntry.objects.filter(kind=Category.KIND_VARIABLE, source_id__in=pks, category=category)
+        self.assertEqual(entries.count(), len(pks))
+        self.assertDerivedDataConsistent()
+
+    def test_bulk_delete_subtracts_rollups_goals_and_ledger(self):
+        queryset = Saving.objects.filter(user=self.user, goal__isnull=False)
+        pks = list(queryset.values_list("pk", flat=True))
+        self.assertEqual(bulk_delete_transactions(Saving, queryset), len(pks))
+        self.assertFalse(Saving.objects.filter(pk__in=pks).exists())
+        self.assertFalse(LedgerEntry.objects.filter(kind=Category.KIND_SAVING, source_id__in=pks).exists())
+        self.assertEqual(SavingGoal.objects.get(user=self.user).total_saved, Decimal("0"))
+        self.assertDerivedDataConsistent()
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("paginas", password="x")
+        seed_transactions(cls.user, rows=45)
+        Income.objects.filter(user=cls.user, pk__in=Income.objects.filter(user=cls.user).values("pk")[:10]).update(
+            date=datetime.date(2025, 6, 1)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def walk(self, params: dict) -> list:
+        pages, cursor = [], None
+        while True:
+            query = {**params, "cursor": cursor} if cursor else params
+            page = self.client.get(reverse("income_list"), query).context["page_obj"]
+            pages.append(page)
+            cursor = page.next_cursor
+            if cursor is None:
+                return pages
+
+    def assertWalkCovers(self, params: dict, expected_pks: set):
+        pages = self.walk(params)
+        seen = [row.pk for page in pages for row in page.object_list]
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), expected_pks)
+        for previous, current in zip(pages, pages[1:]):
+            back = self.client.get(reverse("income_list"), {**params, "cursor": current.previous_cursor})
+            self.assertEqual(
+                [row.pk for row in back.context["page_obj"].object_list],
+                [row.pk for row in previous.object_list],
+            )
+        return pages
+
+    def test_cursor_walk_has_no_duplicates_or_gaps(self):
+        pages = self.assertWalkCovers({}, set(Income.objects.filter(user=self.user).values_list("pk", flat=True)))
+        rows = [(row.date, row.pk) for page in pages for row in page.object_list]
+        self.assertEqual(rows, sorted(rows, reverse=True))
+        self.assertFalse(pages[0].has_previous)
+
+    def test_cursor_walk_with_search_keeps_the_filter(self):
+        matches = Income.objects.filter(user=self.user, description__startswith="Movimiento 1")
+        self.assertWalkCovers({"q": "Movimiento 1"}, set(matches.values_list("pk", flat=True)))
+
+    def test_invalid_cursor_starts_from_the_first_page(self):
+        first = self.client.get(reverse("income_list")).context["page_obj"]
+        page = self.client.get(reverse("income_list"), {"cursor": "no-es-un-cursor"}).context["page_obj"]
+        self.assertEqual([row.pk for row in page.object_list], [row.pk for row in first.object_list])
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("exportar", password="x")
+        seed_transactions(cls.user, rows=12)
+        seed_transactions(get_user_model().objects.create_user("otro usuario", password="x"), rows=3)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def export(self, module: str, **params) -> str:
+        response = self.client.get(reverse("export_transactions", args=[module]), params)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export_streams_filtered_rows(self):
+        content = self.export("income", date_from="2025-01-01", date_to="2025-01-31")
+        self.assertTrue(content.startswith("\ufeff"))
+        rows = list(csv.reader(io.StringIO(content.lstrip("\ufeff"))))
+        self.assertEqual(rows[0], ["fecha", "monto", "descripcion", "categoria", "metodo_pago", "notas", "fuente"])
+        expected = Income.objects.filter(user=self.user, date__month=1).order_by("-date", "-id")
+        self.assertEqual(
+            rows[1:],
+            [
+                [
+                    income.date.isoformat(),
+                    str(income.amount),
+                    income.description,
+                    income.category.name,
+                    income.payment_method.name,
+                    income.notes,
+                    income.source,
+                ]
+                for income in expected
+            ],
+        )
+
+    def test_ndjson_ledger_export_applies_search(self):
+        lines = self.export("ledger", format="ndjson", q="Movimiento 11").splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(len(records), 4)
+        self.assertEqual({record["tipo"] for record in records}, {kind for kind, _ in Category.KIND_CHOICES})
+        self.assertEqual({record["descripcion"] for record in records}, {"Movimiento 11"})
+
+    async def test_async_export_matches_sync_export(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("export_transactions", args=["saving"]), {"format": "ndjson"})
+        content = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual(len(content.splitlines()), 12)
+        self.assertEqual(content, await sync_to_async(self.export)("saving", format="ndjson"))
+
+
+class RecurringExpenseTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("recurrente", password="x")
+        cls.category = Category.objects.create(user=cls.user, name="Vivienda", kind=Category.KIND_FIXED)
+        cls.payment_method = PaymentMethod.objects.create(user=cls.user, name="Banco")
+        for due_day in (5, 31):
+            RecurringFixedExpense.objects.create(
+                user=cls.user,
+                description=f"Pago día {due_day}",
+                amount=Decimal("120.00"),
+                category=cls.category,
+                payment_method=cls.payment_method,
+                due_day=due_day,
+            )
+        inactive = Category.objects.create(user=cls.user, name="Antigua", kind=Category.KIND_FIXED, is_active=False)
+        RecurringFixedExpense.objects.create(
+            user=cls.user,
+            description="Categoría inactiva",
+            amount=Decimal("1.00"),
+            category=inactive,
+            payment_method=cls.payment_method,
+            due_day=1,
+        )
+
+    def rollup_total(self, year: int, month: int) -> Decimal:
+        return MonthlyRollup.objects.get(user=self.user, kind=Category.KIND_FIXED, year=year, month=month).total
+
+    def test_materializes_once_per_month(self):
+        self.assertEqual(materialize_month(2026, 2, dry_run=True), 2)
+        self.assertEqual(materialize_month(2026, 2, batch_size=1), 2)
+        self.assertEqual(materialize_month(2026, 2), 0)
+        expenses = FixedExpense.objects.filter(user=self.user, recurring__isnull=False)
+        self.assertEqual(expenses.count(), 2)
+        self.assertEqual(self.rollup_total(2026, 2), Decimal("240.00"))
+        self.assertEqual(diff_user_rollups(self.user.pk), {})
+        self.assertEqual(diff_user_ledger(self.user.pk), {})
+
+    def test_due_day_is_clamped_to_the_end_of_the_month(self):
+        materialize_month(2026, 2)
+        materialize_month(2028, 2)
+        materialize_month(2026, 4)
+        dates = FixedExpense.objects.filter(user=self.user, description="Pago día 31").values_list("date", flat=True)
+        self.assertEqual(
+            sorted(dates), [datetime.date(2026, 2, 28), datetime.date(2026, 4, 30), datetime.date(2028, 2, 29)]
+        )
+
+    def test_edited_expense_still_counts_as_materialized(self):
+        materialize_month(2026, 3)
+        FixedExpense.objects.filter(user=self.user, description="Pago día 5").update(date=datetime.date(2026, 3, 20))
+        self.assertEqual(materialize_month(2026, 3), 0)
+
+
+class BudgetStatusTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("presupuesto", password="x")
+        payment_method = PaymentMethod.objects.create(user=cls.user, name="Tarjeta")
+        food = Category.objects.create(user=cls.user, name="Comida", kind=Category.KIND_VARIABLE)
+        rent = Category.objects.create(user=cls.user, name="Arriendo", kind=Category.KIND_FIXED)
+        CategoryBudget.objects.create(user=cls.user, category=food, amount=Decimal("300.00"))
+        CategoryBudget.objects.create(user=cls.user, category=rent, amount=Decimal("500.00"))
+        for day, amount in ((2, "100.00"), (9, "50.00")):
+            VariableExpense.objects.create(
+                user=cls.user,
+                date=datetime.date(2025, 4, day),
+                amount=Decimal(amount),
+                category=food,
+                description="Supermercado",
+                payment_method=payment_method,
+                expense_type=VariableExpense.TYPE_NECESSARY,
+            )
+        FixedExpense.objects.create(
+            user=cls.user,
+            date=datetime.date(2025, 4, 1),
+            amount=Decimal("200.00"),
+            category=rent,
+            description="Arriendo",
+            payment_method=payment_method,
+        )
+        RecurringFixedExpense.objects.create(
+            user=cls.user,
+            description="Gastos comunes",
+            amount=Decimal("350.00"),
+            category=rent,
+            payment_method=payment_method,
+            due_day=15,
+        )
+
+    def status(self, today: datetime.date) -> dict:
+        result = get_budget_status(self.user, 2025, 4, today)
+        return {row["category"]: (row["spent"], row["projected"], row["status"]) for row in result["budgets"]}
+
+    def test_projection_before_the_month(self):
+        self.assertEqual(
+            self.status(datetime.date(2025, 3, 20)),
+            {
+                "Comida": (Decimal("150.00"), Decimal("150.00"), "En curso"),
+                "Arriendo": (Decimal("200.00"), Decimal("550.00"), "En riesgo"),
+            },
+        )
+
+    def test_projection_during_the_month(self):
+        self.assertEqual(
+            self.status(datetime.date(2025, 4, 10)),
+            {
+                "Comida": (Decimal("150.00"), Decimal("450.00"), "En riesgo"),
+                "Arriendo": (Decimal("200.00"), Decimal("550.00"), "En riesgo"),
+            },
+        )
+
+    def test_projection_after_the_month(self):
+        result = get_budget_status(self.user, 2025, 4, datetime.date(2025, 5, 3))
+        self.assertEqual(
+            {row["category"]: (row["spent"], row["projected"], row["status"]) for row in result["budgets"]},
+            {
+                "Comida": (Decimal("150.00"), Decimal("150.00"), "En curso"),
+                "Arriendo": (Decimal("200.00"), Decimal("200.00"), "En curso"),
+            },
+        )
+        self.assertEqual(result["totals"]["budget"], Decimal("800.00"))
+        self.assertEqual(result["totals"]["spent"], Decimal("350.00"))
+        self.assertEqual(result["totals"]["overrun"], Decimal("0"))
+
+
+@override_settings(FINANCE_REQUEST_TIMING=True)
+class RequestTimingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("tiempos", password="x")
+        seed_transactions(cls.user, rows=6)
+
+    def test_server_timing_splits_view_db_and_templates(self):
+        self.client.force_login(self.user)
+        with self.assertLogs("finance.timing", level="INFO"):
+            response = self.client.get(reverse("income_list"))
+        timings = {}
+        for entry in response["Server-Timing"].split(", "):
+            name, duration, *_ = entry.split(";")
+            timings[name] = float(duration.removeprefix("dur="))
+        self.assertGreater(timings["tpl"], 0)
+        self.assertGreater(timings["db"], 0)
+        self.assertAlmostEqual(timings["view"] + timings["db"] + timings["tpl"], timings["total"], delta=0.5)
+
+
+class CachedChoiceValidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("opciones", password="x")
+        cls.category = Category.objects.create(user=cls.user, name="Sueldo", kind=Category.KIND_INCOME)
+        cls.payment_method = PaymentMethod.objects.create(user=cls.user, name="Banco")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.client.get(reverse("income_create"))
+
+    def post_income(self):
+        return self.client.post(
+            reverse("income_create"),
+            {
+                "date": "2025-03-01",
+                "amount": "100",
+                "category": self.category.pk,
+                "description": "Sueldo",
+                "payment_method": self.payment_method.pk,
+                "source": "Empresa",
+            },
+        )
+
+    def test_accepts_cached_choice(self):
+        self.assertEqual(self.post_income().status_code, 302)
+        self.assertTrue(Income.objects.filter(user=self.user).exists())
+
+    def test_rejects_choice_deactivated_by_another_process(self):
+        Category.objects.filter(pk=self.category.pk).update(is_active=False)
+        response = self.post_income()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("category", response.context["form"].errors)
+        self.assertFalse(Income.objects.filter(user=self.user).exists())
+
+    def test_rejects_choice_moved_to_another_kind(self):
+        Category.objects.filter(pk=self.category.pk).update(kind=Category.KIND_FIXED)
+        response = self.post_income()
+        self.assertIn("category", response.context["form"].errors)
@@ -1,7 +1,7 @@
 from django.urls import path
 from django.views.generic import RedirectView
 
-from finance import views
+from finance import api, exports, views
 
 urlpatterns = [
     path("", RedirectView.as_view(pattern_name="dashboard_general", permanent=False)),
@@ -10,6 +10,10 @@ urlpatterns = [
     path("dashboards/fixed-expenses/", views.fixed_expense_dashboard, name="fixed_expense_dashboard"),
     path("dashboards/variable-expenses/", views.variable_expense_dashboard, name="variable_expense_dashboard"),
     path("dashboards/savings/", views.saving_dashboard, name="saving_dashboard"),
+    path("dashboards/budgets/", views.budget_dashboard, name="budget_dashboard"),
+    path("api/charts/<slug:dataset>/", api.chart_data, name="chart_data"),
+    path("exportar/<slug:module>/", exports.export_transactions, name="export_transactions"),
+    path("acciones/<slug:module>/", views.transaction_bulk_action, name="transaction_bulk_action"),
     path("ingresos/", views.IncomeListView.as_view(), name="income_list"),
     path("ingresos/nuevo/", views.IncomeCreateView.as_view(), name="income_create"),
     path("ingresos/<int:pk>/editar/", views.IncomeUpdateView.as_view(), name="income_update"),
@@ -35,6 +39,24 @@ urlpatterns = [
     path("savings/goals/<int:pk>/edit/", views.SavingGoalUpdateView.as_view()),
     path("savings/goals/<int:pk>/delete/", views.SavingGoalDeleteView.as_view()),
     path("settings/", views.settings_home, name="settings_home"),
+    path("settings/import/", views.transaction_import, name="settings_import"),
+    path("settings/recurring/", views.RecurringFixedExpenseListView.as_view(), name="settings_recurring"),
+    path("settings/recurring/nuevo/", views.RecurringFixedExpenseCreateView.as_view(), name="settings_recurring_create"),
+    path("settings/recurring/generar/", views.recurring_materialize, name="settings_recurring_materialize"),
+    path(
+        "settings/recurring/<int:pk>/editar/",
+        views.RecurringFixedExpenseUpdateView.as_view(),
+        name="settings_recurring_update",
+    ),
+    path(
+        "settings/recurring/<int:pk>/eliminar/",
+        views.RecurringFixedExpenseDeleteView.as_view(),
+        name="settings_recurring_delete",
+    ),
+    path("settings/budgets/", views.CategoryBudgetListView.as_view(), name="settings_budgets"),
+    path("settings/budgets/nuevo/", views.CategoryBudgetCreateView.as_view(), name="settings_budget_create"),
+    path("settings/budgets/<int:pk>/editar/", views.CategoryBudgetUpdateView.as_view(), name="settings_budget_update"),
+    path("settings/budgets/<int:pk>/eliminar/", views.CategoryBudgetDeleteView.as_view(), name="settings_budget_delete"),
     path("settings/categories/", views.CategoryListView.as_view(), name="settings_categories"),
     path("settings/categories/nuevo/", views.CategoryCreateView.as_view(), name="settings_category_create"),
     path("settings/categories/<int:pk>/editar/", views.CategoryUpdateView.as_view(), name="settings_category_update"),
@@ -1,43 +1,83 @@
 import calendar
-import datetime
 import json
-from decimal import Decimal
+from urllib.parse import quote
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q, Sum
-from django.shortcuts import render
-from django.urls import reverse_lazy
+from django.http import Http404
+from django.shortcuts import redirect, render
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.views.decorators.http import require_POST
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from finance.bulk import bulk_delete_transactions, bulk_update_transactions
+from finance.caching import acached
+from finance.concurrency import run_concurrently
 from finance.forms import (
+    CategoryBudgetForm,
     CategoryForm,
     FixedExpenseForm,
     IncomeForm,
     PaymentMethodForm,
+    RecurringFixedExpenseForm,
     SavingForm,
     SavingGoalForm,
+    TransactionBulkActionForm,
+    TransactionImportForm,
     VariableExpenseForm,
 )
-from finance.models import Category, FixedExpense, Income, PaymentMethod, Saving, SavingGoal, VariableExpense
+from finance.importers import IMPORT_MODELS, import_transactions
+from finance.models import (
+    Category,
+    CategoryBudget,
+    FixedExpense,
+    Income,
+    PaymentMethod,
+    RecurringFixedExpense,
+    Saving,
+    SavingGoal,
+    VariableExpense,
+)
+from finance.pagination import paginate_keyset
+from finance.recurring import materialize_month
+from finance.routers import read_from_replica
+from finance.search import filter_search, rank_search, search_ranked
 from finance.services import (
+    get_budget_status,
     get_category_breakdown,
     get_daily_series,
+    get_expense_category_breakdown,
     get_last_12_months_series,
     get_month_kpis,
     get_saving_distribution,
     get_saving_goal_progress,
+    get_saving_totals,
+    get_top_expenses,
+    get_total,
     get_year_12_months_series,
+    get_yearly_overview_series,
 )
 
+BULK_LIST_URLS = {
+    "income": "income_list",
+    "fixed": "fixed_expense_list",
+    "variable": "variable_expense_list",
+    "saving": "saving_list",
+}
 MONTH_LABELS = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
 
 
 class UserQuerySetMixin:
+    select_related_fields = ()
+
     def get_queryset(self):
-        return super().get_queryset().filter(user=self.request.user)
+        queryset = super().get_queryset().filter(user=self.request.user)
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        return queryset
 
 
 class UserFormMixin:
@@ -59,17 +99,78 @@ class UserFormMixin:
         context["form_title"] = f"{action} {self.model._meta.verbose_name.title()}"
         form = context.get("form")
         if form and "category" in form.fields:
-            context["category_empty"] = not form.fields["category"].queryset.exists()
+            context["category_empty"] = form.fields["category"].is_empty
             context["category_settings_url"] = reverse_lazy("settings_categories")
         if form and "payment_method" in form.fields:
-            context["payment_method_empty"] = not form.fields["payment_method"].queryset.exists()
+            context["payment_method_empty"] = form.fields["payment_method"].is_empty
             context["payment_settings_url"] = reverse_lazy("settings_payment_methods")
         if form and "goal" in form.fields:
-            context["goal_empty"] = not form.fields["goal"].queryset.exists()
+            context["goal_empty"] = form.fields["goal"].is_empty
             context["goal_create_url"] = reverse_lazy("saving_goal_create")
         return context
 
 
+class ReadReplicaMixin:
+    def dispatch(self, request, *args, **kwargs):
+        return read_from_replica(super().dispatch)(request, *args, **kwargs)
+
+
+class KeysetPaginationMixin:
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset, page_size):
+        query = self.request.GET.get("q")
+        ranked = search_ranked(query)
+        if ranked:
+            queryset = rank_search(queryset, self.request.user, query)
+        page = paginate_keyset(
+            queryset,
+            self.request.GET.get(self.cursor_kwarg),
+            page_size,
+            with_count=self.request.GET.get("count") == "1",
+            ranked=ranked,
+        )
+        return None, page, page.object_list, page.has_other_pages()
+
+    def _page_query(self, cursor):
+        query = self.request.GET.copy()
+        query.pop(self.cursor_kwarg, None)
+        query.pop("page", None)
+        if cursor:
+            query[self.cursor_kwarg] = cursor
+        return query.urlencode()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context["page_obj"]
+        context.update(
+            {
+                "keyset_pagination": True,
+                "next_page_query": self._page_query(page.next_cursor),
+                "previous_page_query": self._page_query(page.previous_cursor),
+            }
+        )
+        return context
+
+
+class BulkActionMixin:
+    bulk_module = None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(
+            {
+                "bulk_form": TransactionBulkActionForm(
+                    user=self.request.user,
+                    model=self.model,
+                    initial={"q": self.request.GET.get("q", "")},
+                ),
+                "bulk_action_url": reverse("transaction_bulk_action", args=[self.bulk_module]),
+            }
+        )
+        return context
+
+
 class BaseDeleteView(LoginRequiredMixin, UserQuerySetMixin, DeleteView):
     template_name = "finance/confirm_delete.html"
 
@@ -78,21 +179,21 @@ class BaseDeleteView(LoginRequiredMixin, UserQuerySetMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 
-class IncomeListView(LoginRequiredMixin, UserQuerySetMixin, ListView):
+class IncomeListView(
+    LoginRequiredMixin, ReadReplicaMixin, UserQuerySetMixin, KeysetPaginationMixin, BulkActionMixin, ListView
+):
     model = Income
+    bulk_module = "income"
     template_name = "finance/income_list.html"
     paginate_by = 10
+    select_related_fields = ("category", "payment_method")
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        query = self.request.GET.get("q")
-        if query:
-            queryset = queryset.filter(Q(description__icontains=query) | Q(source__icontains=query))
-        return queryset
+        return filter_search(super().get_queryset(), self.request.user, self.request.GET.get("q"))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context.update({"title": "Ingresos", "create_url": reverse_lazy("income_create")})
+        context.update({"title": "Ingresos", "create_url": reverse_lazy("income_create"), "export_module": "income"})
         return context
 
 
@@ -117,21 +218,21 @@ class IncomeDeleteView(BaseDeleteView):
     success_url = reverse_lazy("income_list")
 
 
-class FixedExpenseListView(LoginRequiredMixin, UserQuerySetMixin, ListView):
+class FixedExpenseListView(
+    LoginRequiredMixin, ReadReplicaMixin, UserQuerySetMixin, KeysetPaginationMixin, BulkActionMixin, ListView
+):
     model = FixedExpense
+    bulk_module = "fixed"
     template_name = "finance/fixed_expense_list.html"
     paginate_by = 10
+    select_related_fields = ("category",)
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        query = self.request.GET.get("q")
-        if query:
-            queryset = queryset.filter(Q(description__icontains=query))
-        return queryset
+        return filter_search(super().get_queryset(), self.request.user, self.request.GET.get("q"))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context.update({"title": "Gastos Fijos", "create_url": reverse_lazy("fixed_expense_create")})
+        context.update({"title": "Gastos Fijos", "create_url": reverse_lazy("fixed_expense_create"), "export_module": "fixed"})
         return context
 
 
@@ -156,21 +257,21 @@ class FixedExpenseDeleteView(BaseDeleteView):
     success_url = reverse_lazy("fixed_expense_list")
 
 
-class VariableExpenseListView(LoginRequiredMixin, UserQuerySetMixin, ListView):
+class VariableExpenseListView(
+    LoginRequiredMixin, ReadReplicaMixin, UserQuerySetMixin, KeysetPaginationMixin, BulkActionMixin, ListView
+):
     model = VariableExpense
+    bulk_module = "variable"
     template_name = "finance/variable_expense_list.html"
     paginate_by = 10
+    select_related_fields = ("category", "payment_method")
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        query = self.request.GET.get("q")
-        if query:
-            queryset = queryset.filter(Q(description__icontains=query))
-        return queryset
+        return filter_search(super().get_queryset(), self.request.user, self.request.GET.get("q"))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context.update({"title": "Gastos Variables", "create_url": reverse_lazy("variable_expense_create")})
+        context.update({"title": "Gastos Variables", "create_url": reverse_lazy("variable_expense_create"), "export_module": "variable"})
         return context
 
 
@@ -195,23 +296,21 @@ class VariableExpenseDeleteView(BaseDeleteView):
     success_url = reverse_lazy("variable_expense_list")
 
 
-class SavingListView(LoginRequiredMixin, UserQuerySetMixin, ListView):
+class SavingListView(
+    LoginRequiredMixin, ReadReplicaMixin, UserQuerySetMixin, KeysetPaginationMixin, BulkActionMixin, ListView
+):
     model = Saving
+    bulk_module = "saving"
     template_name = "finance/saving_list.html"
     paginate_by = 10
+    select_related_fields = ("category", "goal")
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        query = self.request.GET.get("q")
-        if query:
-            queryset = queryset.filter(
-                Q(description__icontains=query) | Q(goal_name__icontains=query) | Q(goal__name__icontains=query)
-            )
-        return queryset
+        return filter_search(super().get_queryset(), self.request.user, self.request.GET.get("q"))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context.update({"title": "Ahorros", "create_url": reverse_lazy("saving_create")})
+        context.update({"title": "Ahorros", "create_url": reverse_lazy("saving_create"), "export_module": "saving"})
         return context
 
 
@@ -244,111 +343,134 @@ class SavingDeleteView(BaseDeleteView):
 
 
 @login_required
-def dashboard(request):
+@read_from_replica
+async def dashboard(request):
+    user = await request.auser()
     today = timezone.localdate()
     year = int(request.GET.get("year", today.year))
     month = int(request.GET.get("month", today.month))
 
-    kpis = get_month_kpis(request.user, year, month)
-
-    income_series = get_year_12_months_series(Income, request.user, year)
-    fixed_series = get_year_12_months_series(FixedExpense, request.user, year)
-    variable_series = get_year_12_months_series(VariableExpense, request.user, year)
-    saving_series = get_year_12_months_series(Saving, request.user, year)
-    expense_series = {
-        "labels": income_series["labels"],
-        "data": [
-            fixed + variable
-            for fixed, variable in zip(fixed_series["data"], variable_series["data"], strict=False)
-        ],
-    }
-
-    expense_category_data = _merge_category_breakdown(
-        get_category_breakdown(request.user, FixedExpense, year, month),
-        get_category_breakdown(request.user, VariableExpense, year, month),
-    )
-
-    top_expenses = _top_expenses(request.user, year, month)
+    data = await acached(user, "dashboard", (year, month), lambda: _dashboard_data(user, year, month))
 
     context = {
         "year": year,
         "month": month,
         "month_name": calendar.month_name[month],
         "months": range(1, 13),
-        "kpis": kpis,
-        "income_series": json.dumps(income_series),
-        "expense_series": json.dumps(expense_series),
-        "saving_series": json.dumps(saving_series),
+        "kpis": data["kpis"],
+        "income_series": json.dumps(data["income_series"]),
+        "expense_series": json.dumps(data["expense_series"]),
+        "saving_series": json.dumps(data["saving_series"]),
         "month_labels": json.dumps(MONTH_LABELS),
-        "expense_category_data": json.dumps(expense_category_data),
-        "top_expenses": top_expenses,
+        "month_names": json.dumps(list(calendar.month_name)),
+        "expense_category_data": json.dumps(data["expense_category_data"]),
+        "top_expenses": data["top_expenses"],
     }
-    return render(request, "finance/dashboard.html", context)
+    return await sync_to_async(render)(request, "finance/dashboard.html", context)
 
 
 @login_required
-def income_dashboard(request):
-    return _module_dashboard(request, Income, "income")
+@read_from_replica
+async def income_dashboard(request):
+    return await _module_dashboard(request, Income, "income")
 
 
 @login_required
-def fixed_expense_dashboard(request):
-    return _module_dashboard(request, FixedExpense, "fixed")
+@read_from_replica
+async def fixed_expense_dashboard(request):
+    return await _module_dashboard(request, FixedExpense, "fixed")
 
 
 @login_required
-def variable_expense_dashboard(request):
-    return _module_dashboard(request, VariableExpense, "variable")
+@read_from_replica
+async def variable_expense_dashboard(request):
+    return await _module_dashboard(request, VariableExpense, "variable")
 
 
 @login_required
-def saving_dashboard(request):
+@read_from_replica
+async def saving_dashboard(request):
+    user = await request.auser()
     today = timezone.localdate()
     year = int(request.GET.get("year", today.year))
     month = int(request.GET.get("month", today.month))
-    start_month = datetime.date(year, month, 1)
-    end_month = datetime.date(year, month, calendar.monthrange(year, month)[1])
-    start_year = datetime.date(year, 1, 1)
-    end_year = datetime.date(year, 12, 31)
-
-    total_month = (
-        Saving.objects.filter(user=request.user, date__range=(start_month, end_month)).aggregate(total=Sum("amount"))[
-            "total"
-        ]
-        or Decimal("0")
-    )
-    total_year = (
-        Saving.objects.filter(user=request.user, date__range=(start_year, end_year)).aggregate(total=Sum("amount"))[
-            "total"
-        ]
-        or Decimal("0")
+    data = await acached(
+        user,
+        "saving_dashboard",
+        (year, month),
+        lambda: _saving_dashboard_data(user, year, month),
     )
-    income_month = (
-        Income.objects.filter(user=request.user, date__range=(start_month, end_month)).aggregate(total=Sum("amount"))[
-            "total"
-        ]
-        or Decimal("0")
-    )
-    saving_pct = (total_month / income_month * Decimal("100")) if income_month else Decimal("0")
-
-    goals_progress = get_saving_goal_progress(request.user)
-    savings_distribution = get_saving_distribution(request.user, year)
-    monthly_series = get_year_12_months_series(Saving, request.user, year)
 
     context = {
         "year": year,
         "month": month,
         "month_name": calendar.month_name[month],
         "months": range(1, 13),
-        "total_month": total_month,
-        "total_year": total_year,
-        "saving_pct": saving_pct,
-        "goals_progress": goals_progress,
-        "saving_distribution": json.dumps(savings_distribution),
-        "monthly_series": json.dumps(monthly_series),
+        "total_month": data["total_month"],
+        "total_year": data["total_year"],
+        "saving_pct": data["saving_pct"],
+        "goals_progress": data["goals_progress"],
+        "saving_distribution": json.dumps(data["saving_distribution"]),
+        "monthly_series": json.dumps(data["monthly_series"]),
         "month_labels": json.dumps(MONTH_LABELS),
+        "month_names": json.dumps(list(calendar.month_name)),
+    }
+    return await sync_to_async(render)(request, "finance/saving_dashboard.html", context)
+
+
+@login_required
+@read_from_replica
+async def budget_dashboard(request):
+    user = await request.auser()
+    today = timezone.localdate()
+    year = int(request.GET.get("year", today.year))
+    month = int(request.GET.get("month", today.month))
+    data = await acached(
+        user,
+        "budget_dashboard",
+        (year, month, today.isoformat()),
+        lambda: _budget_dashboard_data(user, year, month, today),
+    )
+
+    context = {
+        "year": year,
+        "month": month,
+        "month_name": calendar.month_name[month],
+        "months": range(1, 13),
+        "budgets": data["budgets"],
+        "totals": data["totals"],
     }
-    return render(request, "finance/saving_dashboard.html", context)
+    return await sync_to_async(render)(request, "finance/budget_dashboard.html", context)
+
+
+@login_required
+@require_POST
+def transaction_bulk_action(request, module):
+    model = IMPORT_MODELS.get(module)
+    if model is None:
+        raise Http404("Módulo desconocido.")
+    form = TransactionBulkActionForm(request.POST, user=request.user, model=model)
+    list_url = reverse(BULK_LIST_URLS[module])
+    if not form.is_valid():
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return redirect(list_url)
+    query = form.cleaned_data["q"]
+    queryset = model.objects.filter(user=request.user)
+    if form.cleaned_data["select_all"]:
+        queryset = filter_search(queryset, request.user, query)
+    else:
+        queryset = queryset.filter(pk__in=form.cleaned_data["ids"])
+    if form.cleaned_data["action"] == TransactionBulkActionForm.ACTION_DELETE:
+        count = bulk_delete_transactions(model, queryset)
+        messages.success(request, f"{count} registros eliminados.")
+    else:
+        count = bulk_update_transactions(model, queryset, **form.changes())
+        messages.success(request, f"{count} registros actualizados.")
+    if query:
+        list_url = f"{list_url}?q={quote(query)}"
+    return redirect(list_url)
 
 
 @login_required
@@ -356,10 +478,35 @@ def settings_home(request):
     context = {
         "category_count": Category.objects.filter(user=request.user).count(),
         "payment_method_count": PaymentMethod.objects.filter(user=request.user).count(),
+        "recurring_count": RecurringFixedExpense.objects.filter(user=request.user, is_active=True).count(),
+        "budget_count": CategoryBudget.objects.filter(user=request.user, is_active=True).count(),
     }
     return render(request, "finance/settings/home.html", context)
 
 
+@login_required
+def transaction_import(request):
+    result = None
+    form = TransactionImportForm(request.POST or None, request.FILES or None, user=request.user)
+    if request.method == "POST" and form.is_valid():
+        default_category = form.cleaned_data["default_category"]
+        default_payment_method = form.cleaned_data["default_payment_method"]
+        try:
+            result = import_transactions(
+                request.user,
+                IMPORT_MODELS[form.cleaned_data["module"]],
+                form.cleaned_data["file"],
+                form.cleaned_data["file_format"],
+                default_category=default_category.name if default_category else None,
+                default_payment_method=default_payment_method.name if default_payment_method else None,
+            )
+        except ValueError as exc:
+            form.add_error(None, str(exc))
+        else:
+            messages.success(request, f"{result.created} registros importados correctamente.")
+    return render(request, "finance/import_form.html", {"form": form, "result": result})
+
+
 class CategoryListView(LoginRequiredMixin, UserQuerySetMixin, ListView):
     model = Category
     template_name = "finance/settings/category_list.html"
@@ -438,6 +585,93 @@ class PaymentMethodDeleteView(BaseDeleteView):
     success_url = reverse_lazy("settings_payment_methods")
 
 
+class RecurringFixedExpenseListView(LoginRequiredMixin, UserQuerySetMixin, ListView):
+    model = RecurringFixedExpense
+    template_name = "finance/settings/recurring_list.html"
+    paginate_by = 10
+    select_related_fields = ("category", "payment_method")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({"title": "Gastos recurrentes", "create_url": reverse_lazy("settings_recurring_create")})
+        return context
+
+
+class RecurringFixedExpenseFormMixin(UserFormMixin):
+    model = RecurringFixedExpense
+    form_class = RecurringFixedExpenseForm
+    template_name = "finance/form.html"
+    success_url = reverse_lazy("settings_recurring")
+    category_kind = Category.KIND_FIXED
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["form_title"] = "Editar gasto recurrente" if getattr(self, "object", None) else "Nuevo gasto recurrente"
+        return context
+
+
+class RecurringFixedExpenseCreateView(LoginRequiredMixin, RecurringFixedExpenseFormMixin, CreateView):
+    pass
+
+
+class RecurringFixedExpenseUpdateView(LoginRequiredMixin, RecurringFixedExpenseFormMixin, UserQuerySetMixin, UpdateView):
+    pass
+
+
+class RecurringFixedExpenseDeleteView(BaseDeleteView):
+    model = RecurringFixedExpense
+    success_url = reverse_lazy("settings_recurring")
+
+
+@login_required
+@require_POST
+def recurring_materialize(request):
+    today = timezone.localdate()
+    created = materialize_month(today.year, today.month, user_ids=[request.user.pk])
+    if created:
+        messages.success(request, f"{created} gastos fijos generados para {MONTH_LABELS[today.month - 1]} {today.year}.")
+    else:
+        messages.info(request, f"Los gastos fijos de {MONTH_LABELS[today.month - 1]} {today.year} ya estaban generados.")
+    return redirect("settings_recurring")
+
+
+class CategoryBudgetListView(LoginRequiredMixin, UserQuerySetMixin, ListView):
+    model = CategoryBudget
+    template_name = "finance/settings/budget_list.html"
+    paginate_by = 10
+    select_related_fields = ("category",)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({"title": "Presupuestos", "create_url": reverse_lazy("settings_budget_create")})
+        return context
+
+
+class CategoryBudgetFormMixin(UserFormMixin):
+    model = CategoryBudget
+    form_class = CategoryBudgetForm
+    template_name = "finance/form.html"
+    success_url = reverse_lazy("settings_budgets")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["form_title"] = "Editar presupuesto" if getattr(self, "object", None) else "Nuevo presupuesto"
+        return context
+
+
+class CategoryBudgetCreateView(LoginRequiredMixin, CategoryBudgetFormMixin, CreateView):
+    pass
+
+
+class CategoryBudgetUpdateView(LoginRequiredMixin, CategoryBudgetFormMixin, UserQuerySetMixin, UpdateView):
+    pass
+
+
+class CategoryBudgetDeleteView(BaseDeleteView):
+    model = CategoryBudget
+    success_url = reverse_lazy("settings_budgets")
+
+
 class SavingGoalListView(LoginRequiredMixin, UserQuerySetMixin, ListView):
     model = SavingGoal
     template_name = "finance/saving_goal_list.html"
@@ -468,8 +702,10 @@ class SavingGoalUpdateView(LoginRequiredMixin, UserQuerySetMixin, UpdateView):
     success_url = reverse_lazy("saving_goal_list")
 
     def form_valid(self, form):
+        self.object = form.save(commit=False)
+        self.object.save(update_fields=SavingGoalForm.Meta.fields)
         messages.success(self.request, "Meta actualizada correctamente.")
-        return super().form_valid(form)
+        return redirect(self.get_success_url())
 
 
 class SavingGoalDeleteView(BaseDeleteView):
@@ -477,60 +713,74 @@ class SavingGoalDeleteView(BaseDeleteView):
     success_url = reverse_lazy("saving_goal_list")
 
 
-def _module_dashboard(request, model, slug):
+async def _module_dashboard(request, model, slug):
+    user = await request.auser()
     today = timezone.localdate()
     year = int(request.GET.get("year", today.year))
     month = int(request.GET.get("month", today.month))
-    start = datetime.date(year, month, 1)
-    end = datetime.date(year, month, calendar.monthrange(year, month)[1])
-
-    total_month = (
-        model.objects.filter(user=request.user, date__range=(start, end)).aggregate(total=Sum("amount"))["total"]
-        or Decimal("0")
+    data = await acached(
+        user,
+        f"module_dashboard:{slug}",
+        (year, month, today.isoformat()),
+        lambda: _module_dashboard_data(user, model, year, month),
     )
-    last_12 = get_last_12_months_series(request.user, model)
-    category_data = get_category_breakdown(request.user, model, year, month)
-    daily_series = get_daily_series(request.user, model, year, month)
 
     context = {
         "year": year,
         "month": month,
         "month_name": calendar.month_name[month],
         "months": range(1, 13),
-        "total_month": total_month,
-        "last_12": json.dumps(last_12),
-        "category_data": json.dumps(category_data),
-        "daily_series": json.dumps(daily_series),
+        "total_month": data["total_month"],
+        "last_12": json.dumps(data["last_12"]),
+        "category_data": json.dumps(data["category_data"]),
+        "daily_series": json.dumps(data["daily_series"]),
+        "month_names": json.dumps(list(calendar.month_name)),
         "slug": slug,
     }
-    return render(request, "finance/module_dashboard.html", context)
-
-
-def _merge_category_breakdown(primary, secondary):
-    totals = {}
-    for label, value in zip(primary["labels"], primary["data"], strict=False):
-        totals[label] = totals.get(label, 0) + value
-    for label, value in zip(secondary["labels"], secondary["data"], strict=False):
-        totals[label] = totals.get(label, 0) + value
-    labels = list(totals.keys())
-    data = [totals[label] for label in labels]
-    return {"labels": labels, "data": data}
-
-
-def _top_expenses(user, year, month):
-    start = datetime.date(year, month, 1)
-    end = datetime.date(year, month, calendar.monthrange(year, month)[1])
-    fixed = (
-        FixedExpense.objects.filter(user=user, date__range=(start, end))
-        .values("description", "amount", "category__name")
+    return await sync_to_async(render)(request, "finance/module_dashboard.html", context)
+
+
+async def _module_dashboard_data(user, model, year, month):
+    return await run_concurrently(
+        {
+            "total_month": lambda: get_total(user, model, year, month),
+            "last_12": lambda: get_last_12_months_series(user, model),
+            "category_data": lambda: get_category_breakdown(user, model, year, month),
+            "daily_series": lambda: get_daily_series(user, model, year, month),
+        }
+    )
+
+
+async def _dashboard_data(user, year, month):
+    data = await run_concurrently(
+        {
+            "kpis": lambda: get_month_kpis(user, year, month),
+            "yearly_series": lambda: get_yearly_overview_series(user, year),
+            "expense_category_data": lambda: get_expense_category_breakdown(user, year, month),
+            "top_expenses": lambda: get_top_expenses(user, year, month),
+        }
     )
-    variable = (
-        VariableExpense.objects.filter(user=user, date__range=(start, end))
-        .values("description", "amount", "category__name")
+    yearly_series = data.pop("yearly_series")
+    return {
+        **data,
+        "income_series": yearly_series["income"],
+        "expense_series": yearly_series["expense"],
+        "saving_series": yearly_series["saving"],
+    }
+
+
+async def _budget_dashboard_data(user, year, month, today):
+    data = await run_concurrently({"status": lambda: get_budget_status(user, year, month, today)})
+    return data["status"]
+
+
+async def _saving_dashboard_data(user, year, month):
+    data = await run_concurrently(
+        {
+            "totals": lambda: get_saving_totals(user, year, month),
+            "goals_progress": lambda: get_saving_goal_progress(user),
+            "saving_distribution": lambda: get_saving_distribution(user, year),
+            "monthly_series": lambda: get_year_12_months_series(Saving, user, year),
+        }
     )
-    combined = [
-        {"description": item["description"], "amount": item["amount"], "category": item["category__name"]}
-        for item in list(fixed) + list(variable)
-    ]
-    combined.sort(key=lambda item: item["amount"], reverse=True)
-    return combined[:10]
+    return {**data.pop("totals"), **data}